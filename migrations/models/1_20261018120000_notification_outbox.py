@@ -0,0 +1,28 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "notification_outbox" (
+    "id" BIGSERIAL NOT NULL PRIMARY KEY,
+    "batch_id" UUID NOT NULL,
+    "chat_id" BIGINT NOT NULL,
+    "text" TEXT NOT NULL,
+    "reply_markup" JSONB,
+    "status" VARCHAR(10) NOT NULL DEFAULT 'pending',
+    "attempts" INT NOT NULL DEFAULT 0,
+    "last_error" TEXT,
+    "claimed_at" TIMESTAMPTZ,
+    "created_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "notification_id" INT REFERENCES "event_notifications" ("id") ON DELETE CASCADE,
+    CONSTRAINT "uid_notificatio_batch_i_8d2f41" UNIQUE ("batch_id", "chat_id")
+);
+COMMENT ON COLUMN "notification_outbox"."status" IS 'PENDING: pending\nPROCESSING: processing\nSENT: sent\nFAILED: failed';
+CREATE INDEX IF NOT EXISTS "idx_notification_outbox_claim" ON "notification_outbox" ("status", "id")
+    WHERE "status" IN ('pending', 'processing');"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "notification_outbox";"""
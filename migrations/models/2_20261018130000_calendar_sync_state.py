@@ -0,0 +1,17 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "calendar_sync_state" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "calendar_id" VARCHAR(255) NOT NULL UNIQUE,
+    "sync_token" TEXT,
+    "full_synced_at" TIMESTAMPTZ,
+    "updated_at" TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "calendar_sync_state";"""
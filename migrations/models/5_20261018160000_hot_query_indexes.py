@@ -0,0 +1,24 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_users_is_approved_is_banned" ON "users" ("is_approved", "is_banned", "id");
+CREATE INDEX IF NOT EXISTS "idx_users_recipients" ON "users" ("id") INCLUDE ("telegram_id", "locale")
+    WHERE "is_approved" AND NOT "is_banned";
+CREATE INDEX IF NOT EXISTS "idx_users_admins" ON "users" ("id") WHERE "role" = 'admin';
+CREATE INDEX IF NOT EXISTS "idx_event_participants_event_reaction" ON "event_participants" ("event_id", "reaction")
+    INCLUDE ("user_id");
+CREATE INDEX IF NOT EXISTS "idx_event_notifications_event_type_sent" ON "event_notifications"
+    ("event_id", "notification_type", "sent_at" DESC);
+CREATE INDEX IF NOT EXISTS "idx_events_status_created_at" ON "events" ("status", "created_at" DESC);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_users_is_approved_is_banned";
+DROP INDEX IF EXISTS "idx_users_recipients";
+DROP INDEX IF EXISTS "idx_users_admins";
+DROP INDEX IF EXISTS "idx_event_participants_event_reaction";
+DROP INDEX IF EXISTS "idx_event_notifications_event_type_sent";
+DROP INDEX IF EXISTS "idx_events_status_created_at";"""
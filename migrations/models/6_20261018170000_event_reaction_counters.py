@@ -0,0 +1,26 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "events" ADD "going_count" INT NOT NULL DEFAULT 0;
+ALTER TABLE "events" ADD "not_going_count" INT NOT NULL DEFAULT 0;
+ALTER TABLE "events" ADD "thinking_count" INT NOT NULL DEFAULT 0;
+UPDATE "events" AS e
+SET "going_count" = c."going", "not_going_count" = c."not_going", "thinking_count" = c."thinking"
+FROM (
+    SELECT "event_id",
+           count(*) FILTER (WHERE "reaction" = 'going') AS "going",
+           count(*) FILTER (WHERE "reaction" = 'not_going') AS "not_going",
+           count(*) FILTER (WHERE "reaction" = 'thinking') AS "thinking"
+    FROM "event_participants"
+    GROUP BY "event_id"
+) AS c
+WHERE e."id" = c."event_id";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "events" DROP COLUMN "going_count";
+ALTER TABLE "events" DROP COLUMN "not_going_count";
+ALTER TABLE "events" DROP COLUMN "thinking_count";"""
@@ -0,0 +1,14 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_users_section_created_at" ON "users"
+    ("is_approved", "is_banned", "created_at", "id");
+DROP INDEX IF EXISTS "idx_users_is_approved_is_banned";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE INDEX IF NOT EXISTS "idx_users_is_approved_is_banned" ON "users" ("is_approved", "is_banned", "id");
+DROP INDEX IF EXISTS "idx_users_section_created_at";"""
@@ -0,0 +1,19 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "users" ADD "unreachable_at" TIMESTAMPTZ;
+ALTER TABLE "notification_outbox" ADD "next_attempt_at" TIMESTAMPTZ;
+DROP INDEX IF EXISTS "idx_users_recipients";
+CREATE INDEX IF NOT EXISTS "idx_users_recipients" ON "users" ("id") INCLUDE ("telegram_id", "locale")
+    WHERE "is_approved" AND NOT "is_banned" AND "unreachable_at" IS NULL;"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP INDEX IF EXISTS "idx_users_recipients";
+CREATE INDEX IF NOT EXISTS "idx_users_recipients" ON "users" ("id") INCLUDE ("telegram_id", "locale")
+    WHERE "is_approved" AND NOT "is_banned";
+ALTER TABLE "users" DROP COLUMN "unreachable_at";
+ALTER TABLE "notification_outbox" DROP COLUMN "next_attempt_at";"""
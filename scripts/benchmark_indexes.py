@@ -0,0 +1,191 @@
+"""
+Бенчмарк индексов из миграций 5_20261018160000_hot_query_indexes, 7_20261018180000_users_section_keyset_index
+и 8_20261018190000_delivery_failures.
+
+Во временной схеме создаются таблицы (миграция init и колонки из миграций с индексами), заполняются
+тестовыми данными (100k пользователей, 1M участий), после чего горячие запросы выполняются через
+EXPLAIN ANALYZE до и после создания индексов. В конце схема удаляется.
+
+Запуск из корня проекта (подключение к БД берётся из .env):
+    uv run python -m scripts.benchmark_indexes
+"""
+import argparse
+import asyncio
+import importlib
+import re
+
+import asyncpg
+
+from src.bot.main.config import config
+
+
+SCHEMA = "bench_indexes"
+
+USERS_COUNT = 100_000
+EVENTS_COUNT = 200
+PARTICIPATIONS_COUNT = 1_000_000
+NOTIFICATIONS_PER_EVENT = 50
+
+# Получатели рассылки: запрос UsersRepository.iter_approved_recipients в том виде, в котором его строит Tortoise
+# (keyset по id с параметрами), - на нём проверяется частичный индекс idx_users_recipients
+RECIPIENTS_QUERY = """SELECT "id" "0","telegram_id" "1","locale" "2" FROM "users"
+    WHERE "is_approved"=$1 AND "is_banned"=$2 AND "unreachable_at" IS NULL AND "id">$3 ORDER BY "id" ASC LIMIT $4"""
+
+# Запросы в том виде, в котором их выполняют репозитории, и их параметры
+QUERIES: dict[str, tuple[str, tuple]] = {
+    "recipients first chunk": (RECIPIENTS_QUERY, (True, False, 0, 1000)),
+    "recipients middle chunk": (RECIPIENTS_QUERY, (True, False, USERS_COUNT // 2, 1000)),
+    "pending users count":
+        ("""SELECT count(*) FROM "users" WHERE "is_approved" = false AND "is_banned" = false""", ()),
+    "users section page (keyset)":
+        ("""SELECT "id", "telegram_id", "name", "username", "created_at" FROM "users"
+           WHERE "is_approved" = false AND "is_banned" = false
+             AND ("created_at" > now() - interval '60 days' OR "id" > 50000)
+             AND "created_at" >= now() - interval '60 days'
+           ORDER BY "created_at", "id" LIMIT 26""", ()),
+    "admins":
+        ("""SELECT * FROM "users" WHERE "role" = 'admin'""", ()),
+    "thinking participants":
+        ("""SELECT * FROM "event_participants" WHERE "event_id" = 100 AND "reaction" = 'thinking'""", ()),
+    "reaction stats (GROUP BY)":
+        ("""SELECT "event_id", "reaction", count(*) FROM "event_participants"
+           WHERE "event_id" = ANY(ARRAY[1, 50, 100, 150, 200]) GROUP BY "event_id", "reaction" """, ()),
+    "last reminders (GROUP BY)":
+        ("""SELECT "event_id", max("sent_at") FROM "event_notifications"
+           WHERE "event_id" = ANY(ARRAY[1, 50, 100, 150, 200]) AND "notification_type" = 'reminder'
+           GROUP BY "event_id" """, ()),
+    "recent active events":
+        ("""SELECT * FROM "events" WHERE "status" = 'active' ORDER BY "created_at" DESC LIMIT 10""", ()),
+}
+
+# Миграции, создающие таблицы бенчмарка (notification_outbox нужна для колонки из миграции 8)
+SCHEMA_MIGRATIONS = ("0_20251030180355_init", "1_20261018120000_notification_outbox")
+# Миграции с индексами, которые сравнивает бенчмарк. Их остальные команды (новые колонки)
+# выполняются до замера "до", индексы - перед замером "после"
+INDEX_MIGRATIONS = (
+    "5_20261018160000_hot_query_indexes",
+    "7_20261018180000_users_section_keyset_index",
+    "8_20261018190000_delivery_failures",
+)
+
+SEED_SQL = f"""
+INSERT INTO "users" ("telegram_id", "name", "username", "locale", "role", "is_approved", "is_banned", "created_at",
+                     "unreachable_at")
+SELECT 1000000 + i, 'user ' || i, 'user_' || i,
+       (ARRAY['ru', 'en'])[1 + i % 2],
+       CASE WHEN i % 10000 = 0 THEN 'admin' ELSE 'user' END,
+       i % 20 NOT IN (0, 1),
+       i % 20 = 1,
+       now() - make_interval(mins => i),
+       CASE WHEN i % 50 = 2 THEN now() END
+FROM generate_series(1, {USERS_COUNT}) AS i;
+
+INSERT INTO "events" ("google_event_id", "title", "description", "start_time", "end_time", "status",
+                      "reminder_intervals", "created_at")
+SELECT 'bench_' || i, 'event ' || i, '',
+       now() + make_interval(days => i % 60), now() + make_interval(days => i % 60, hours => 2),
+       (ARRAY['active', 'cancelled', 'completed'])[1 + i % 3],
+       '[]'::jsonb, now() - make_interval(hours => i)
+FROM generate_series(1, {EVENTS_COUNT}) AS i;
+
+-- Для одного события пользователи не повторяются: i * 7919 по модулю числа пользователей - перестановка
+INSERT INTO "event_participants" ("event_id", "user_id", "reaction", "reacted_at")
+SELECT 1 + i / {PARTICIPATIONS_COUNT // EVENTS_COUNT},
+       1 + (i::bigint * 7919) % {USERS_COUNT},
+       (ARRAY['going', 'not_going', 'thinking', NULL])[1 + i % 4],
+       now()
+FROM generate_series(0, {PARTICIPATIONS_COUNT - 1}) AS i;
+
+INSERT INTO "event_notifications" ("event_id", "notification_type", "sent_at")
+SELECT e, (ARRAY['new_event', 'reminder', 'postponed'])[1 + n % 3], now() - make_interval(hours => n)
+FROM generate_series(1, {EVENTS_COUNT}) AS e, generate_series(1, {NOTIFICATIONS_PER_EVENT}) AS n;
+"""
+
+
+ANALYZE_SQL = 'ANALYZE "users", "events", "event_participants", "event_notifications"'
+
+
+async def load_migration_sql(module_name: str) -> str:
+    """SQL миграции aerich: бенчмарк проверяет ровно те индексы, которые попадут в БД"""
+    module = importlib.import_module(f"migrations.models.{module_name}")
+    return await module.upgrade(None)
+
+
+def split_index_statements(sql: str) -> tuple[list[str], list[str]]:
+    """Команды миграции: изменения схемы и отдельно создание/удаление индексов"""
+    schema, indexes = [], []
+    for statement in filter(None, (part.strip() for part in sql.split(";"))):
+        is_index = re.match(r"(CREATE|DROP) INDEX", statement)
+        (indexes if is_index else schema).append(statement)
+    return schema, indexes
+
+
+async def explain(connection: asyncpg.Connection) -> dict[str, tuple[str, float]]:
+    """Способы чтения таблиц в плане и время выполнения каждого запроса"""
+    results = {}
+    for name, (query, args) in QUERIES.items():
+        rows = await connection.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {query}", *args)
+        plan = [row[0] for row in rows]
+        scans = sorted({match for line in plan for match in re.findall(r"(Seq Scan|Index Only Scan|"
+                                                                        r"Bitmap Index Scan|Index Scan)", line)})
+        execution_time = next(
+            float(re.search(r"([\d.]+) ms", line).group(1)) for line in plan if line.startswith("Execution Time")
+        )
+        results[name] = (", ".join(scans) or plan[0].split("  (")[0].strip(), execution_time)
+    return results
+
+
+def print_report(before: dict[str, tuple[str, float]], after: dict[str, tuple[str, float]]) -> None:
+    header = f"{'запрос':<28} | {'план до':<32} | {'мс до':>9} | {'план после':<32} | {'мс после':>9}"
+    print(header)
+    print("-" * len(header))
+    for name in QUERIES:
+        plan_before, time_before = before[name]
+        plan_after, time_after = after[name]
+        print(f"{name:<28} | {plan_before:<32} | {time_before:>9.2f} | {plan_after:<32} | {time_after:>9.2f}")
+
+
+async def main(keep: bool) -> None:
+    pg = config.postgresql
+    connection = await asyncpg.connect(
+        user=pg.user, password=pg.password, host=pg.host, port=pg.port, database=pg.database
+    )
+
+    try:
+        await connection.execute(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE; CREATE SCHEMA "{SCHEMA}"')
+        await connection.execute(f'SET search_path TO "{SCHEMA}"')
+        for migration in SCHEMA_MIGRATIONS:
+            await connection.execute(await load_migration_sql(migration))
+
+        index_statements = []
+        for migration in INDEX_MIGRATIONS:
+            schema, indexes = split_index_statements(await load_migration_sql(migration))
+            for statement in schema:
+                await connection.execute(statement)
+            index_statements.extend(indexes)
+
+        print("Заполнение тестовыми данными...")
+        await connection.execute(SEED_SQL)
+        await connection.execute(ANALYZE_SQL)
+
+        before = await explain(connection)
+
+        print("Создание индексов...")
+        for statement in index_statements:
+            await connection.execute(statement)
+        await connection.execute(ANALYZE_SQL)
+
+        after = await explain(connection)
+        print_report(before, after)
+
+    finally:
+        if not keep:
+            await connection.execute(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE')
+        await connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keep", action="store_true", help=f"не удалять схему {SCHEMA} после бенчмарка")
+    args = parser.parse_args()
+    asyncio.run(main(keep=args.keep))
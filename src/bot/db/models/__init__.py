@@ -1,5 +1,8 @@
 from .user import User
 from ...misc.enums.user_role import UserRole
 from .event import Event, EventParticipant, EventNotification
+from .outbox import OutboxMessage
+from .calendar import CalendarSyncState
+from .fsm import FSMRecord
 from ...misc.enums.event_reaction import EventReaction
 from ...misc.enums.event_status import EventStatus
@@ -0,0 +1,16 @@
+from tortoise import Model, fields
+
+
+class CalendarSyncState(Model):
+    """Состояние инкрементальной синхронизации календаря"""
+    id = fields.IntField(pk=True)
+    calendar_id = fields.CharField(max_length=255, unique=True)
+    sync_token = fields.TextField(null=True)  # nextSyncToken из events().list
+    full_synced_at = fields.DatetimeField(null=True)  # Время последней полной синхронизации
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    def __repr__(self):
+        return f"[id:{self.id}] {self.calendar_id}"
+
+    class Meta:
+        table = "calendar_sync_state"
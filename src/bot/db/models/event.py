@@ -14,11 +14,17 @@ class Event(Model):
     end_time = fields.DatetimeField()
     location = fields.CharField(max_length=500, null=True)
     status = fields.CharEnumField(EventStatus, default=EventStatus.ACTIVE)
+    etag = fields.CharField(max_length=255, null=True)  # ETag события в Google Calendar
     
     # JSON поля для настроек события
     reminder_intervals = fields.JSONField(default=list)  # Интервалы напоминаний в минутах
     poll_interval = fields.IntField(default=24)  # Интервал повторного опроса в часах
     deadline = fields.DatetimeField(null=True)  # Дедлайн для выбора "Пойду"
+
+    # Счётчики реакций, обновляются вместе с реакциями участников
+    going_count = fields.IntField(default=0)
+    not_going_count = fields.IntField(default=0)
+    thinking_count = fields.IntField(default=0)
     
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
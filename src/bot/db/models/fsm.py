@@ -0,0 +1,15 @@
+from tortoise import Model, fields
+
+
+class FSMRecord(Model):
+    """Состояние и данные FSM aiogram по ключу хранилища"""
+    key = fields.CharField(max_length=255, pk=True)  # Ключ DefaultKeyBuilder: fsm:<chat_id>:<user_id>:<destiny>
+    state = fields.CharField(max_length=255, null=True)
+    data = fields.JSONField(default=dict)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    def __repr__(self):
+        return f"[{self.key}] {self.state}"
+
+    class Meta:
+        table = "fsm_states"
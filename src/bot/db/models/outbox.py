@@ -0,0 +1,29 @@
+from tortoise import Model, fields
+
+from src.bot.misc.enums.outbox_status import OutboxStatus
+
+
+class OutboxMessage(Model):
+    """Сообщение рассылки, ожидающее отправки (одна строка на получателя)"""
+    id = fields.BigIntField(pk=True)
+    batch_id = fields.UUIDField()  # Общий идентификатор всех сообщений одной рассылки
+    notification = fields.ForeignKeyField(
+        "models.EventNotification", related_name="outbox_messages", null=True
+    )
+    chat_id = fields.BigIntField()
+    text = fields.TextField()
+    reply_markup = fields.JSONField(null=True)
+    status = fields.CharEnumField(OutboxStatus, default=OutboxStatus.PENDING)
+    attempts = fields.IntField(default=0)
+    last_error = fields.TextField(null=True)
+    claimed_at = fields.DatetimeField(null=True)
+    next_attempt_at = fields.DatetimeField(null=True)  # Не раньше какого времени повторять после временной ошибки
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+    def __repr__(self):
+        return f"[id:{self.id}] {self.chat_id} {self.status}"
+
+    class Meta:
+        table = "notification_outbox"
+        unique_together = ("batch_id", "chat_id")
@@ -12,6 +12,8 @@ class User(Model):
     role = fields.CharEnumField(UserRole, default=UserRole.USER)
     is_approved = fields.BooleanField(default=False)
     is_banned = fields.BooleanField(default=False)
+    # Когда выяснилось, что пользователь недоступен (заблокировал бота, удалил аккаунт). Сбрасывается по /start
+    unreachable_at = fields.DatetimeField(null=True)
     created_at = fields.DatetimeField(auto_now_add=True)
 
     def __str__(self):
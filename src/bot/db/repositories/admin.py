@@ -1,26 +1,35 @@
+from datetime import datetime
+
 from loguru import logger
-from src.bot.db.models import User, EventParticipant, Event
-from src.bot.misc.enums.event_reaction import EventReaction
+from tortoise.expressions import Q
+from tortoise.functions import Count
+
+from src.bot.db.models import User, Event
+from src.bot.db.repositories.events import EventsRepository
+from src.bot.utils.cache import TTLCache, MISSING
 
 
 class AdminRepository:
     # Количество пользователей на странице
     USERS_PER_PAGE = 25
 
+    # Поля, которые выводятся в списке пользователей (и нужны для курсора)
+    USER_LIST_FIELDS = ("id", "telegram_id", "name", "username", "created_at")
+
+    # Количество пользователей по разделам: точное значение для списков не нужно, поэтому оно кэшируется
+    _section_counts: TTLCache[str, dict[str, int]] = TTLCache(maxsize=1, ttl=30)
+
     @staticmethod
     async def get_admin_stats():
         """Получение статистики для админ-панели"""
         try:
-            total_users = await User.all().count()
-            approved_users = await User.filter(is_approved=True, is_banned=False).count()
-            pending_users = await User.filter(is_approved=False, is_banned=False).count()
-            banned_users = await User.filter(is_banned=True).count()
+            counts = await AdminRepository.get_section_counts()
 
             return {
-                'total_users': total_users,
-                'approved_users': approved_users,
-                'pending_users': pending_users,
-                'banned_users': banned_users
+                'total_users': sum(counts.values()),
+                'approved_users': counts["approved"],
+                'pending_users': counts["pending"],
+                'banned_users': counts["banned"]
             }
         except Exception as e:
             logger.error(f"Ошибка получения статистики админ-панели: {e}")
@@ -32,41 +41,103 @@ class AdminRepository:
             }
 
     @staticmethod
-    async def get_users_by_section(section: str, page: int = 1, limit: int = None):
-        """Получение пользователей по разделу с пагинацией"""
+    def _get_section_filter(section: str) -> dict | None:
+        if section == "pending":
+            return {"is_approved": False, "is_banned": False}
+        elif section == "approved":
+            return {"is_approved": True, "is_banned": False}
+        elif section == "banned":
+            return {"is_banned": True}
+        return None
+
+    @staticmethod
+    async def get_users_page(
+            section: str,
+            cursor: tuple[datetime, int] | None = None,
+            backward: bool = False,
+            limit: int = None
+    ) -> tuple[list[User], bool]:
+        """
+        Страница пользователей раздела, упорядоченных по (created_at, id).
+        Keyset-пагинация: страница начинается сразу после курсора (или перед ним при backward),
+        поэтому дальние страницы читаются так же быстро, как первая.
+        Возвращает пользователей по возрастанию и признак того, что в направлении движения есть ещё страницы
+        """
         try:
             if limit is None:
                 limit = AdminRepository.USERS_PER_PAGE
 
-            offset = (page - 1) * limit
+            section_filter = AdminRepository._get_section_filter(section)
+            if section_filter is None:
+                return [], False
 
-            if section == "pending":
-                query = User.filter(is_approved=False, is_banned=False)
-            elif section == "approved":
-                query = User.filter(is_approved=True, is_banned=False)
-            elif section == "banned":
-                query = User.filter(is_banned=True)
-            else:
-                return []
+            query = User.filter(**section_filter)
+            if cursor:
+                created_at, user_id = cursor
+                # Условие по created_at задаёт начало сканирования индекса, Q отсекает записи до курсора
+                # с тем же created_at
+                if backward:
+                    query = query.filter(
+                        Q(created_at__lt=created_at) | Q(id__lt=user_id), created_at__lte=created_at
+                    )
+                else:
+                    query = query.filter(
+                        Q(created_at__gt=created_at) | Q(id__gt=user_id), created_at__gte=created_at
+                    )
+
+            ordering = ("-created_at", "-id") if backward else ("created_at", "id")
+            users = await (
+                query.order_by(*ordering)
+                .limit(limit + 1)
+                .only(*AdminRepository.USER_LIST_FIELDS)
+            )
 
-            return await query.offset(offset).limit(limit).all()
+            has_more = len(users) > limit
+            users = users[:limit]
+            if backward:
+                users.reverse()
+            return users, has_more
 
         except Exception as e:
             logger.error(f"Ошибка получения пользователей по разделу {section}: {e}")
-            return []
+            return [], False
+
+    @staticmethod
+    async def get_section_counts() -> dict[str, int]:
+        """Количество пользователей по разделам одним запросом (кэшируется на несколько секунд)"""
+        counts = AdminRepository._section_counts.get("sections")
+        if counts is not MISSING:
+            return counts
+
+        rows = await (
+            User.annotate(count=Count("id"))
+            .group_by("is_approved", "is_banned")
+            .values("is_approved", "is_banned", "count")
+        )
+
+        counts = {"pending": 0, "approved": 0, "banned": 0}
+        for row in rows:
+            if row["is_banned"]:
+                counts["banned"] += row["count"]
+            elif row["is_approved"]:
+                counts["approved"] += row["count"]
+            else:
+                counts["pending"] += row["count"]
+
+        AdminRepository._section_counts.set("sections", counts)
+        return counts
+
+    @staticmethod
+    def invalidate_section_counts() -> None:
+        """Сброс кэша количества пользователей после изменения статуса"""
+        AdminRepository._section_counts.clear()
 
     @staticmethod
     async def get_users_count_by_section(section: str) -> int:
         """Получить общее количество пользователей в разделе"""
         try:
-            if section == "pending":
-                return await User.filter(is_approved=False, is_banned=False).count()
-            elif section == "approved":
-                return await User.filter(is_approved=True, is_banned=False).count()
-            elif section == "banned":
-                return await User.filter(is_banned=True).count()
-            else:
-                return 0
+            counts = await AdminRepository.get_section_counts()
+            return counts.get(section, 0)
         except Exception as e:
             logger.error(f"Ошибка подсчета пользователей раздела {section}: {e}")
             return 0
@@ -79,17 +150,12 @@ class AdminRepository:
             query = query.limit(limit=limit)
         return await query.all()
 
+    @staticmethod
+    async def get_events_stats(events) -> dict[int, dict[str, int]]:
+        """Статистика реакций для нескольких событий (по счётчикам событий, без запросов к БД)"""
+        return {event.id: EventsRepository.get_reaction_counts(event) for event in events}
+
     @staticmethod
     async def get_event_stats(event):
         """Получение статистики реакций для события"""
-        participants = await EventParticipant.filter(event=event).all()
-
-        going_count = sum(1 for p in participants if p.reaction == EventReaction.GOING)
-        not_going_count = sum(1 for p in participants if p.reaction == EventReaction.NOT_GOING)
-        thinking_count = sum(1 for p in participants if p.reaction == EventReaction.THINKING)
-
-        return {
-            'going_count': going_count,
-            'not_going_count': not_going_count,
-            'thinking_count': thinking_count
-        }
+        return EventsRepository.get_reaction_counts(event)
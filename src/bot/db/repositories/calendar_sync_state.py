@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+
+from loguru import logger
+
+from src.bot.db.models import CalendarSyncState
+
+
+class CalendarSyncStateRepository:
+
+    @staticmethod
+    async def get(calendar_id: str) -> CalendarSyncState | None:
+        """Получение состояния синхронизации календаря"""
+        try:
+            return await CalendarSyncState.get_or_none(calendar_id=calendar_id)
+        except Exception as e:
+            logger.error(f"Ошибка получения состояния синхронизации {calendar_id}: {e}")
+            return None
+
+    @staticmethod
+    async def save_sync_token(calendar_id: str, sync_token: str | None, full_sync: bool = False) -> None:
+        """Сохранение sync token после успешной синхронизации"""
+        defaults = {"sync_token": sync_token}
+        if full_sync:
+            defaults["full_synced_at"] = datetime.now(tz=timezone.utc)
+
+        await CalendarSyncState.update_or_create(calendar_id=calendar_id, defaults=defaults)
+
+    @staticmethod
+    async def reset_sync_token(calendar_id: str) -> None:
+        """Сброс sync token (например, после 410 Gone)"""
+        await CalendarSyncState.filter(calendar_id=calendar_id).update(sync_token=None)
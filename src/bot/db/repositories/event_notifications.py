@@ -1,3 +1,7 @@
+from datetime import datetime
+
+from tortoise.functions import Max
+
 from src.bot.db.models import EventNotification, Event
 from src.bot.misc.enums.notification_type import NotificationType
 
@@ -12,9 +16,13 @@ class EventNotificationsRepository:
         return result
 
     @staticmethod
-    async def get_last_reminder(event: Event) -> EventNotification | None:
-        """Получение последнего напоминания для события"""
-        return await EventNotification.filter(
-            event=event,
+    async def get_last_reminders(event_ids: list[int]) -> dict[int, datetime]:
+        """Время последнего напоминания для каждого из событий (одним запросом)"""
+        if not event_ids:
+            return {}
+
+        rows = await EventNotification.filter(
+            event_id__in=event_ids,
             notification_type=NotificationType.REMINDER
-        ).order_by('-sent_at').first()
+        ).annotate(last_sent_at=Max("sent_at")).group_by("event_id").values("event_id", "last_sent_at")
+        return {row["event_id"]: row["last_sent_at"] for row in rows}
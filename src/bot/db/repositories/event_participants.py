@@ -1,45 +1,124 @@
-from typing import Optional, Tuple
-from loguru import logger
+from dataclasses import dataclass
+from datetime import datetime
+
+from tortoise import connections
 
 from src.bot.db.models import EventParticipant, Event, User
 from src.bot.misc.enums.event_reaction import EventReaction
 
 
+@dataclass(frozen=True, slots=True)
+class ReactionUpdate:
+    is_approved: bool
+    deadline_passed: bool
+    reaction: EventReaction | None  # Сохранённая реакция (None, если реакция не принята)
+
+
 class EventParticipantsRepository:
+    # Повторы, если параллельный запрос того же пользователя первым вставил участие
+    UPSERT_ATTEMPTS = 2
+    # prev блокирует текущее участие и запоминает старую реакцию, updated/inserted сохраняют новую,
+    # counters переносит голос в счётчиках события на разницу между ними
+    UPSERT_REACTION_SQL = """
+        WITH ctx AS (
+            SELECT e."id" AS "event_id", u."id" AS "user_id", u."is_approved",
+                   ($3::varchar = 'going' AND e."deadline" < $4::timestamptz) IS TRUE AS "deadline_passed"
+            FROM "events" AS e, "users" AS u
+            WHERE e."id" = $1 AND u."telegram_id" = $2
+        ), allowed AS (
+            SELECT "event_id", "user_id" FROM ctx WHERE "is_approved" AND NOT "deadline_passed"
+        ), prev AS (
+            SELECT p."id", p."reaction"
+            FROM "event_participants" AS p
+            JOIN allowed AS a ON p."event_id" = a."event_id" AND p."user_id" = a."user_id"
+            FOR UPDATE OF p
+        ), updated AS (
+            UPDATE "event_participants" AS p
+            SET "reaction" = $3, "reacted_at" = now()
+            FROM prev
+            WHERE p."id" = prev."id"
+            RETURNING prev."reaction" AS "old_reaction", p."reaction"
+        ), inserted AS (
+            INSERT INTO "event_participants" ("event_id", "user_id", "reaction", "reacted_at")
+            SELECT "event_id", "user_id", $3, now() FROM allowed
+            WHERE NOT EXISTS (SELECT 1 FROM prev)
+            ON CONFLICT ("event_id", "user_id") DO NOTHING
+            RETURNING NULL::varchar AS "old_reaction", "reaction"
+        ), changed AS (
+            SELECT "old_reaction", "reaction" FROM updated
+            UNION ALL
+            SELECT "old_reaction", "reaction" FROM inserted
+        ), counters AS (
+            UPDATE "events" AS e
+            SET "going_count" = e."going_count"
+                    + (c."reaction" IS NOT DISTINCT FROM 'going')::int
+                    - (c."old_reaction" IS NOT DISTINCT FROM 'going')::int,
+                "not_going_count" = e."not_going_count"
+                    + (c."reaction" IS NOT DISTINCT FROM 'not_going')::int
+                    - (c."old_reaction" IS NOT DISTINCT FROM 'not_going')::int,
+                "thinking_count" = e."thinking_count"
+                    + (c."reaction" IS NOT DISTINCT FROM 'thinking')::int
+                    - (c."old_reaction" IS NOT DISTINCT FROM 'thinking')::int
+            FROM changed AS c
+            WHERE e."id" = $1 AND c."old_reaction" IS DISTINCT FROM c."reaction"
+        )
+        SELECT ctx."is_approved", ctx."deadline_passed", (SELECT "reaction" FROM changed) AS "reaction"
+        FROM ctx
+    """
 
     @staticmethod
-    async def get_or_create_participation(
-            event: Event,
-            user: User,
-            reaction: EventReaction
-    ) -> Tuple[EventParticipant, bool]:
-        """Получение или создание участия в событии"""
-        try:
-            participation, created = await EventParticipant.get_or_create(
-                event=event,
-                user=user,
-                defaults={'reaction': reaction}
+    async def upsert_reaction(
+            event_id: int,
+            telegram_id: int,
+            reaction: EventReaction,
+            deadline_check_at: datetime | None = None
+    ) -> ReactionUpdate | None:
+        """
+        Сохранение реакции одним запросом: поиск события и пользователя, проверки одобрения и дедлайна "Пойду",
+        вставка или обновление участия и перенос голоса в счётчиках события.
+        Возвращает None, если событие или пользователь не найдены
+        """
+        for _ in range(EventParticipantsRepository.UPSERT_ATTEMPTS):
+            rows = await connections.get("default").execute_query_dict(
+                EventParticipantsRepository.UPSERT_REACTION_SQL,
+                [event_id, telegram_id, reaction.value, deadline_check_at],
             )
+            if not rows:
+                return None
 
-            if not created:
-                participation.reaction = reaction
-                await participation.save()
+            row = rows[0]
+            result = ReactionUpdate(
+                is_approved=row["is_approved"],
+                deadline_passed=row["deadline_passed"],
+                reaction=EventReaction(row["reaction"]) if row["reaction"] else None,
+            )
+            # Реакция не сохранена при допустимом запросе - параллельный запрос того же пользователя
+            # успел вставить участие первым. Повторная попытка обновит уже существующую строку
+            if result.reaction or not result.is_approved or result.deadline_passed:
+                return result
 
-            return participation, created
+        return result
 
-        except Exception as e:
-            logger.error(f"Ошибка получения/создания участия: {e}")
-            raise
+    @staticmethod
+    async def set_reaction(event: Event, user: User, reaction: EventReaction) -> EventReaction | None:
+        """Сохранение реакции уже проверенного пользователя. Возвращает сохранённую реакцию"""
+        result = await EventParticipantsRepository.upsert_reaction(event.id, user.telegram_id, reaction)
+        return result.reaction if result else None
 
     @staticmethod
-    async def get_user_reaction(event: Event, user: User) -> EventReaction | None:
-        """Получение реакции пользователя на событие"""
-        try:
-            participation = await EventParticipant.get_or_none(event=event, user=user)
-            return participation.reaction if participation else None
-        except Exception as e:
-            logger.error(f"Ошибка получения реакции пользователя: {e}")
-            return None
+    async def release_user_reactions(user: User) -> None:
+        """Вычесть реакции пользователя из счётчиков событий (перед удалением пользователя)"""
+        await connections.get("default").execute_query(
+            """
+            UPDATE "events" AS e
+            SET "going_count" = e."going_count" - (p."reaction" = $2)::int,
+                "not_going_count" = e."not_going_count" - (p."reaction" = $3)::int,
+                "thinking_count" = e."thinking_count" - (p."reaction" = $4)::int
+            FROM "event_participants" AS p
+            WHERE p."event_id" = e."id" AND p."user_id" = $1 AND p."reaction" IS NOT NULL
+            """,
+            [user.id, EventReaction.GOING.value, EventReaction.NOT_GOING.value, EventReaction.THINKING.value],
+        )
 
     @staticmethod
     async def get_participants_by_reactions(event, reactions: list):
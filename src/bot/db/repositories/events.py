@@ -1,10 +1,22 @@
+import json
+from datetime import datetime, timezone
+from typing import Iterable
+
 from loguru import logger
+from tortoise import connections
 
 from src.bot.db.models import Event
 from src.bot.misc.enums.event_status import EventStatus
+from src.bot.misc.enums.event_reaction import EventReaction
 
 
 class EventsRepository:
+    # Поля счётчиков событий по реакциям
+    REACTION_COUNTERS = {
+        EventReaction.GOING: "going_count",
+        EventReaction.NOT_GOING: "not_going_count",
+        EventReaction.THINKING: "thinking_count",
+    }
 
     @staticmethod
     async def get_by_id(event_id: int) -> Event | None:
@@ -41,7 +53,8 @@ class EventsRepository:
         start_time,
         end_time,
         location: str = "",
-        status: EventStatus = EventStatus.ACTIVE
+        status: EventStatus = EventStatus.ACTIVE,
+        etag: str | None = None
     ) -> Event | None:
         """Создание нового события в БД"""
         try:
@@ -52,7 +65,8 @@ class EventsRepository:
                 start_time=start_time,
                 end_time=end_time,
                 location=location,
-                status=status
+                status=status,
+                etag=etag
             )
             logger.info(f"Создано новое событие в БД: {title}")
             return event
@@ -60,21 +74,99 @@ class EventsRepository:
             logger.error(f"Ошибка создания события в БД: {e}")
             return None
 
+    @staticmethod
+    async def create_many(events: list[Event]) -> list[Event]:
+        """
+        Массовое создание событий. Возвращает только действительно созданные события с ID.
+        События с уже существующим google_event_id (их создала другая реплика или страница
+        обрабатывается повторно) пропускаются и не возвращаются, чтобы о них не оповестили ещё раз
+        """
+        if not events:
+            return []
+
+        now = datetime.now(tz=timezone.utc)
+        rows = await connections.get("default").execute_query_dict(
+            """
+            INSERT INTO "events" (
+                "google_event_id", "title", "description", "start_time", "end_time", "location", "status",
+                "etag", "reminder_intervals", "poll_interval", "deadline", "created_at", "updated_at"
+            )
+            SELECT e."google_event_id", e."title", e."description", e."start_time", e."end_time", e."location",
+                   e."status", e."etag", e."reminder_intervals"::jsonb, e."poll_interval", e."deadline", $12, $12
+            FROM unnest(
+                $1::text[], $2::text[], $3::text[], $4::timestamptz[], $5::timestamptz[], $6::text[],
+                $7::text[], $8::text[], $9::text[], $10::int[], $11::timestamptz[]
+            ) AS e(
+                "google_event_id", "title", "description", "start_time", "end_time", "location",
+                "status", "etag", "reminder_intervals", "poll_interval", "deadline"
+            )
+            ON CONFLICT ("google_event_id") DO NOTHING
+            RETURNING "id", "google_event_id"
+            """,
+            [
+                [event.google_event_id for event in events],
+                [event.title for event in events],
+                [event.description for event in events],
+                [event.start_time for event in events],
+                [event.end_time for event in events],
+                [event.location for event in events],
+                [EventStatus(event.status).value for event in events],
+                [event.etag for event in events],
+                [json.dumps(event.reminder_intervals) for event in events],
+                [event.poll_interval for event in events],
+                [event.deadline for event in events],
+                now,
+            ],
+        )
+
+        created_ids = {row["google_event_id"]: row["id"] for row in rows}
+        created: list[Event] = []
+        for event in events:
+            event_id = created_ids.get(event.google_event_id)
+            if event_id is None:
+                continue
+            event.id = event_id
+            event.created_at = event.updated_at = now
+            event._saved_in_db = True
+            created.append(event)
+
+        if len(created) < len(events):
+            logger.info(f"Пропущено уже существующих событий: {len(events) - len(created)}")
+        logger.info(f"Создано новых событий в БД: {len(created)}")
+        return created
+
+    @staticmethod
+    async def update_many(events: list[Event], fields: Iterable[str]) -> None:
+        """Массовое обновление указанных полей событий"""
+        if not events:
+            return
+
+        await Event.bulk_update(events, fields=list(fields))
+        logger.info(f"Обновлено событий в БД: {len(events)}")
+
     @staticmethod
     async def update(event: Event, **kwargs) -> bool:
         """Обновление события в БД"""
         try:
+            update_fields = []
             for key, value in kwargs.items():
                 if hasattr(event, key) and value is not None:
                     setattr(event, key, value)
-            
-            await event.save()
+                    update_fields.append(key)
+
+            # Сохраняются только переданные поля, чтобы не перезаписать счётчики реакций устаревшими значениями
+            await event.save(update_fields=update_fields + ["updated_at"])
             logger.info(f"Обновлено событие в БД: {event.title}")
             return True
         except Exception as e:
             logger.error(f"Ошибка обновления события {event.id} в БД: {e}")
             return False
 
+    @staticmethod
+    def get_reaction_counts(event: Event) -> dict[str, int]:
+        """Количество реакций события по счётчикам"""
+        return {field: getattr(event, field) for field in EventsRepository.REACTION_COUNTERS.values()}
+
     @staticmethod
     async def get_all_active() -> list[Event]:
         """Получение всех активных событий"""
@@ -84,6 +176,15 @@ class EventsRepository:
             logger.error(f"Ошибка получения активных событий из БД: {e}")
             return []
 
+    @staticmethod
+    async def get_upcoming_active(now: datetime) -> list[Event]:
+        """Получение активных событий, которые ещё не начались"""
+        try:
+            return await Event.filter(status=EventStatus.ACTIVE, start_time__gt=now).all()
+        except Exception as e:
+            logger.error(f"Ошибка получения предстоящих событий из БД: {e}")
+            return []
+
     @staticmethod
     async def delete(event: Event) -> bool:
         """Удаление события из БД"""
@@ -0,0 +1,64 @@
+import json
+from typing import Any
+
+from tortoise import connections
+from tortoise.transactions import in_transaction
+
+from src.bot.db.models import FSMRecord
+
+
+class FSMRepository:
+
+    @staticmethod
+    async def get(key: str) -> FSMRecord | None:
+        """Получение состояния FSM по ключу"""
+        return await FSMRecord.get_or_none(key=key)
+
+    @staticmethod
+    async def save(states: dict[str, str | None], data: dict[str, dict[str, Any]]) -> None:
+        """
+        Сохранение пачки изменений одной транзакцией: состояния и данные пишутся отдельными upsert
+        (каждый меняет только свою колонку), после чего пустые записи (без состояния и данных) удаляются
+        """
+        if not states and not data:
+            return
+
+        async with in_transaction() as connection:
+            if states:
+                await connection.execute_query(
+                    """
+                    INSERT INTO "fsm_states" ("key", "state", "data", "updated_at")
+                    SELECT t."key", t."state", '{}'::jsonb, now()
+                    FROM unnest($1::varchar[], $2::varchar[]) AS t("key", "state")
+                    ON CONFLICT ("key") DO UPDATE
+                    SET "state" = EXCLUDED."state", "updated_at" = EXCLUDED."updated_at"
+                    """,
+                    [list(states), list(states.values())],
+                )
+
+            if data:
+                await connection.execute_query(
+                    """
+                    INSERT INTO "fsm_states" ("key", "state", "data", "updated_at")
+                    SELECT t."key", NULL, t."data"::jsonb, now()
+                    FROM unnest($1::varchar[], $2::text[]) AS t("key", "data")
+                    ON CONFLICT ("key") DO UPDATE
+                    SET "data" = EXCLUDED."data", "updated_at" = EXCLUDED."updated_at"
+                    """,
+                    [list(data), [json.dumps(value, ensure_ascii=False) for value in data.values()]],
+                )
+
+            await connection.execute_query(
+                """DELETE FROM "fsm_states"
+                WHERE "key" = ANY($1::varchar[]) AND "state" IS NULL AND "data" = '{}'::jsonb""",
+                [list(states.keys() | data.keys())],
+            )
+
+    @staticmethod
+    async def delete_expired(ttl_seconds: int) -> int:
+        """Удаление состояний, которые не менялись дольше ttl_seconds. Возвращает количество удалённых"""
+        count, _ = await connections.get("default").execute_query(
+            'DELETE FROM "fsm_states" WHERE "updated_at" < now() - make_interval(secs => $1)',
+            [ttl_seconds],
+        )
+        return count
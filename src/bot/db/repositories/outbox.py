@@ -0,0 +1,178 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable, Callable, Iterable
+
+from tortoise import connections
+
+from src.bot.db.models import OutboxMessage, EventNotification
+from src.bot.misc.enums.outbox_status import OutboxStatus
+from src.bot.services.message_sender import OutgoingMessage
+
+
+class OutboxRepository:
+    # Размер пачки при вставке строк рассылки
+    INSERT_BATCH_SIZE = 1000
+
+    @staticmethod
+    async def enqueue(
+            messages: Iterable[OutgoingMessage] | AsyncIterable[OutgoingMessage],
+            notification: EventNotification | None = None,
+            on_batch: Callable[[], None] | None = None,
+    ) -> tuple[uuid.UUID, int]:
+        """
+        Постановка сообщений рассылки в очередь. Возвращает id рассылки и количество сообщений.
+        Сообщения вставляются пачками по мере чтения, после каждой пачки вызывается on_batch
+        """
+        batch_id = uuid.uuid4()
+        rows: list[OutboxMessage] = []
+        count = 0
+
+        async def flush() -> None:
+            nonlocal rows, count
+            await OutboxMessage.bulk_create(rows, ignore_conflicts=True)
+            count += len(rows)
+            rows = []
+            if on_batch:
+                on_batch()
+
+        async for message in OutboxRepository._iterate(messages):
+            rows.append(OutboxMessage(
+                batch_id=batch_id,
+                notification=notification,
+                chat_id=message.chat_id,
+                text=message.text,
+                reply_markup=message.keyboard.model_dump(exclude_none=True) if message.keyboard else None,
+            ))
+
+            if len(rows) >= OutboxRepository.INSERT_BATCH_SIZE:
+                await flush()
+
+        if rows:
+            await flush()
+
+        return batch_id, count
+
+    @staticmethod
+    async def _iterate(messages: Iterable[OutgoingMessage] | AsyncIterable[OutgoingMessage]):
+        if isinstance(messages, AsyncIterable):
+            async for message in messages:
+                yield message
+        else:
+            for message in messages:
+                yield message
+
+    @staticmethod
+    async def claim_batch(limit: int, lease_seconds: int) -> list[dict[str, Any]]:
+        """
+        Захват пачки сообщений для отправки.
+        SKIP LOCKED позволяет нескольким воркерам разбирать очередь, не получая одни и те же строки.
+        Строки, зависшие в processing дольше lease_seconds (воркер упал), забираются повторно.
+        """
+        rows = await connections.get("default").execute_query_dict(
+            """
+            UPDATE "notification_outbox" AS o
+            SET "status" = $3, "claimed_at" = now(), "updated_at" = now(), "attempts" = o."attempts" + 1
+            WHERE o."id" IN (
+                SELECT "id" FROM "notification_outbox"
+                WHERE ("status" = $4 AND ("next_attempt_at" IS NULL OR "next_attempt_at" <= now()))
+                   OR ("status" = $3 AND "claimed_at" < now() - make_interval(secs => $2))
+                ORDER BY "id"
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING o."id", o."chat_id", o."text", o."reply_markup", o."attempts"
+            """,
+            [limit, lease_seconds, OutboxStatus.PROCESSING.value, OutboxStatus.PENDING.value],
+        )
+
+        for row in rows:
+            if isinstance(row["reply_markup"], str):
+                row["reply_markup"] = json.loads(row["reply_markup"])
+
+        return rows
+
+    @staticmethod
+    async def mark_sent(ids: list[int]) -> None:
+        """Отметить сообщения отправленными"""
+        if not ids:
+            return
+        await OutboxMessage.filter(id__in=ids).update(
+            status=OutboxStatus.SENT,
+            updated_at=datetime.now(tz=timezone.utc),
+        )
+
+    @staticmethod
+    async def mark_failed(errors: dict[int, str | None]) -> None:
+        """Отметить сообщения неотправленными окончательно (dead letter) с причиной для каждого"""
+        if not errors:
+            return
+        await connections.get("default").execute_query(
+            """UPDATE "notification_outbox" AS o
+            SET "status" = $3, "last_error" = e."error", "next_attempt_at" = NULL, "updated_at" = now()
+            FROM unnest($1::bigint[], $2::text[]) AS e("id", "error")
+            WHERE o."id" = e."id"
+            """,
+            [list(errors), list(errors.values()), OutboxStatus.FAILED.value],
+        )
+
+    @staticmethod
+    async def schedule_retry(errors: dict[int, str | None], base_delay: float, max_delay: float) -> None:
+        """
+        Вернуть сообщения в очередь после временной ошибки.
+        Задержка растёт экспоненциально по числу попыток: base_delay * 2^(attempts - 1), но не больше max_delay
+        """
+        if not errors:
+            return
+        await connections.get("default").execute_query(
+            """UPDATE "notification_outbox" AS o
+            SET "status" = $3, "last_error" = e."error", "claimed_at" = NULL, "updated_at" = now(),
+                "next_attempt_at" = now() + make_interval(secs => least($5, $4 * power(2, o."attempts" - 1)))
+            FROM unnest($1::bigint[], $2::text[]) AS e("id", "error")
+            WHERE o."id" = e."id"
+            """,
+            [list(errors), list(errors.values()), OutboxStatus.PENDING.value, float(base_delay), float(max_delay)],
+        )
+
+    @staticmethod
+    async def fail_pending_for_chats(chat_ids: list[int], error: str) -> int:
+        """Снять с очереди ещё не отправленные сообщения недоступным получателям. Возвращает их количество"""
+        if not chat_ids:
+            return 0
+        return await OutboxMessage.filter(chat_id__in=chat_ids, status=OutboxStatus.PENDING).update(
+            status=OutboxStatus.FAILED,
+            last_error=error,
+            next_attempt_at=None,
+            updated_at=datetime.now(tz=timezone.utc),
+        )
+
+    @staticmethod
+    async def get_batch_progress(batch_id: uuid.UUID) -> dict[str, int]:
+        """
+        Ход рассылки: отправлено (sent), не удалось (failed), ждут повтора после временной ошибки (retrying)
+        и ещё не прошли первую попытку (awaiting). attempts увеличивается при захвате строки, поэтому
+        строка в processing с attempts = 1 ещё в первой попытке
+        """
+        rows = await connections.get("default").execute_query_dict(
+            """
+            SELECT
+                count(*) FILTER (WHERE "status" = $2) AS "sent",
+                count(*) FILTER (WHERE "status" = $3) AS "failed",
+                count(*) FILTER (
+                    WHERE ("status" = $4 AND "attempts" >= 1) OR ("status" = $5 AND "attempts" >= 2)
+                ) AS "retrying",
+                count(*) FILTER (
+                    WHERE ("status" = $4 AND "attempts" = 0) OR ("status" = $5 AND "attempts" <= 1)
+                ) AS "awaiting"
+            FROM "notification_outbox"
+            WHERE "batch_id" = $1
+            """,
+            [
+                batch_id,
+                OutboxStatus.SENT.value,
+                OutboxStatus.FAILED.value,
+                OutboxStatus.PENDING.value,
+                OutboxStatus.PROCESSING.value,
+            ],
+        )
+        return dict(rows[0])
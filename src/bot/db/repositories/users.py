@@ -1,10 +1,20 @@
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
 from loguru import logger
+from tortoise.transactions import in_transaction
 
 from src.bot.db.models import User
 from src.bot.misc.enums.user_role import UserRole
+from src.bot.db.repositories.admin import AdminRepository
+from src.bot.db.repositories.event_participants import EventParticipantsRepository
+from src.bot.utils.cache import TTLCache, MISSING
 
 
 class UsersRepository:
+    # Пользователи по Telegram ID (в том числе отсутствующие - None).
+    # Изменения через репозиторий сбрасывают запись, изменения в других процессах видны через ttl секунд
+    _cache: TTLCache[int, User | None] = TTLCache(maxsize=10_000, ttl=60)
 
     @staticmethod
     async def create_or_update_user(
@@ -18,6 +28,8 @@ class UsersRepository:
             "name": name,
             "username": username,
             "role": role,
+            # Пользователь написал боту - значит, снова доступен для рассылок
+            "unreachable_at": None,
         }
 
         try:
@@ -34,6 +46,9 @@ class UsersRepository:
             )
             raise
 
+        UsersRepository._cache.set(telegram_id, user)
+        if is_created:
+            AdminRepository.invalidate_section_counts()
         return is_created, user
 
     @staticmethod
@@ -46,9 +61,57 @@ class UsersRepository:
             return None
 
     @staticmethod
-    async def get_approved_users():
-        """Получение всех одобренных пользователей"""
-        return await User.filter(is_approved=True, is_banned=False).all()
+    async def get_cached_by_telegram_id(telegram_id: int) -> User | None:
+        """Получение пользователя по Telegram ID через кэш"""
+        user = UsersRepository._cache.get(telegram_id)
+        if user is MISSING:
+            user = await UsersRepository.get_by_telegram_id(telegram_id)
+            UsersRepository._cache.set(telegram_id, user)
+        return user
+
+    @staticmethod
+    def invalidate_cache(telegram_id: int) -> None:
+        """Сброс пользователя в кэше после изменения (вместе с количеством пользователей по разделам)"""
+        UsersRepository._cache.invalidate(telegram_id)
+        AdminRepository.invalidate_section_counts()
+
+    @staticmethod
+    async def iter_approved_recipients(chunk_size: int = 1000) -> AsyncIterator[list[tuple[int, str | None]]]:
+        """
+        Получатели рассылок (одобренные, не забаненные и доступные) пачками по chunk_size:
+        пары (telegram_id, locale).
+        Пачки читаются по id (keyset) из частичного индекса idx_users_recipients, поэтому в памяти
+        одновременно только одна пачка, а первая приходит сразу
+        """
+        last_id = 0
+        while True:
+            rows = await (
+                User.filter(is_approved=True, is_banned=False, unreachable_at__isnull=True, id__gt=last_id)
+                .order_by("id")
+                .limit(chunk_size)
+                .values_list("id", "telegram_id", "locale")
+            )
+            if not rows:
+                return
+
+            last_id = rows[-1][0]
+            yield [(telegram_id, locale) for _, telegram_id, locale in rows]
+
+            if len(rows) < chunk_size:
+                return
+
+    @staticmethod
+    async def mark_unreachable(telegram_ids: list[int]) -> int:
+        """Отметить пользователей недоступными для рассылок. Возвращает количество отмеченных"""
+        if not telegram_ids:
+            return 0
+
+        count = await User.filter(telegram_id__in=telegram_ids, unreachable_at__isnull=True).update(
+            unreachable_at=datetime.now(tz=timezone.utc)
+        )
+        for telegram_id in telegram_ids:
+            UsersRepository._cache.invalidate(telegram_id)
+        return count
 
     @staticmethod
     async def get_by_id(user_id: int):
@@ -60,21 +123,27 @@ class UsersRepository:
         """Одобрение пользователя"""
         user.is_approved = True
         await user.save()
+        UsersRepository.invalidate_cache(user.telegram_id)
 
     @staticmethod
     async def delete_user(user):
-        """Удаление пользователя"""
-        await user.delete()
+        """Удаление пользователя (его реакции вычитаются из счётчиков событий)"""
+        async with in_transaction():
+            await EventParticipantsRepository.release_user_reactions(user)
+            await user.delete()
+        UsersRepository.invalidate_cache(user.telegram_id)
 
     @staticmethod
     async def ban_user(user):
         user.is_banned = True
         await user.save()
+        UsersRepository.invalidate_cache(user.telegram_id)
 
     @staticmethod
     async def unban_user(user):
         user.is_banned = False
         await user.save()
+        UsersRepository.invalidate_cache(user.telegram_id)
 
     @staticmethod
     async def get_all_admins():
@@ -85,8 +154,8 @@ class UsersRepository:
     async def is_admin(user_telegram_id: int) -> bool:
         """Проверяет, является ли пользователь администратором"""
         try:
-            user = await User.get_or_none(telegram_id=user_telegram_id)
-            return user and user.role == UserRole.ADMIN
+            user = await UsersRepository.get_cached_by_telegram_id(user_telegram_id)
+            return bool(user) and user.role == UserRole.ADMIN
         except Exception as e:
             logger.error(f"Ошибка проверки прав администратора для {user_telegram_id}: {e}")
             return False
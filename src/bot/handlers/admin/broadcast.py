@@ -78,7 +78,8 @@ async def process_broadcast_message(
         await state.update_data(broadcast_text=broadcast_text)
 
         # Показываем подтверждение
-        text = translator.get("broadcast_confirmation", message=broadcast_text)
+        recipients_count = await NotificationService.get_recipients_count()
+        text = translator.get("broadcast_confirmation", message=broadcast_text, count=recipients_count)
         keyboard = get_broadcast_confirmation_keyboard(translator)
 
         await message.answer(text, reply_markup=keyboard)
@@ -113,10 +114,10 @@ async def confirm_broadcast(
 
         # Запускаем рассылку
         notification_service = NotificationService(bot=callback.bot)
-        sent_count = await notification_service.broadcast_message(broadcast_text)
+        sent_count, retrying_count = await notification_service.broadcast_message(broadcast_text)
 
         # Показываем результат
-        result_text = translator.get("broadcast_completed", count=sent_count)
+        result_text = translator.get("broadcast_completed", count=sent_count, retrying=retrying_count)
         keyboard = get_admin_menu_keyboard(translator)
 
         await callback.message.answer(result_text, reply_markup=keyboard)
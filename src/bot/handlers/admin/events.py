@@ -16,12 +16,13 @@ async def event_statistics(callback: CallbackQuery, translator: LocalizedTransla
     """Статистика событий"""
     try:
         recent_events = await AdminRepository.get_recent_events()
+        events_stats = await AdminRepository.get_events_stats(recent_events)
 
         text = translator.get("event_stats_title") + "\n\n"
         bot_username: str = (await callback.bot.get_me()).username
 
         for event in recent_events:
-            stats = await AdminRepository.get_event_stats(event)
+            stats = events_stats[event.id]
             event_detail_link: str = DeeplinkService.get_event_details_link(
                 bot_username=bot_username,
                 event_id=event.id
@@ -41,17 +41,7 @@ async def handle_users_section_callback(
         translator: LocalizedTranslator
 ):
     """Обработать callback раздела пользователей с пагинацией"""
-    await show_users_section(callback, callback_data.section, callback_data.page, translator)
-
-
-@router.callback_query(UserManagementCallback.filter())
-async def handle_users_section_callback(
-        callback: CallbackQuery,
-        callback_data: UserManagementCallback,
-        translator: LocalizedTranslator
-):
-    """Обработать callback раздела пользователей"""
-    await show_users_section(callback, callback_data.section, translator)
+    await show_users_section(callback, callback_data, translator)
 
 
 @router.callback_query(UserActionCallback.filter(F.action == UserAction.DETAILS))
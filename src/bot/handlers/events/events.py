@@ -4,8 +4,6 @@ from aiogram.exceptions import TelegramBadRequest
 from loguru import logger
 
 from src.bot.db.models import Event
-from src.bot.db.repositories.events import EventsRepository
-from src.bot.db.repositories.users import UsersRepository
 from src.bot.db.repositories.event_participants import EventParticipantsRepository
 from src.bot.misc.enums.event_reaction import EventReaction
 from src.bot.misc.callback_data.user import EventReactionCD
@@ -23,11 +21,16 @@ async def handle_event_reaction(
 ):
     """Обработка реакции пользователя на событие"""
     try:
-        # Получаем событие и пользователя через репозитории
-        event = await EventsRepository.get_by_id(callback_data.event_id)
-        user = await UsersRepository.get_by_telegram_id(callback.from_user.id)
+        # Поиск события и пользователя, проверки и сохранение реакции - одним запросом.
+        # Одобрение проверяется по БД, а не по кэшу пользователя: его могли одобрить в другой реплике
+        result = await EventParticipantsRepository.upsert_reaction(
+            event_id=callback_data.event_id,
+            telegram_id=callback.from_user.id,
+            reaction=callback_data.reaction,
+            deadline_check_at=callback.message.date
+        )
 
-        if not event or not user:
+        if not result:
             await callback.answer(
                 translator.get("error_event_not_found"),
                 show_alert=True
@@ -35,7 +38,7 @@ async def handle_event_reaction(
             return
 
         # Проверяем, одобрен ли пользователь
-        if not user.is_approved:
+        if not result.is_approved:
             await callback.answer(
                 translator.get("error_user_not_approved"),
                 show_alert=True
@@ -43,29 +46,20 @@ async def handle_event_reaction(
             return
 
         # Проверяем дедлайн для выбора "Пойду"
-        if (callback_data.reaction == EventReaction.GOING and
-                event.deadline and
-                event.deadline < callback.message.date):
+        if result.deadline_passed:
             await callback.answer(
                 translator.get("error_deadline_passed"),
                 show_alert=True
             )
             return
 
-        # Обновляем реакцию пользователя
-        await EventParticipantsRepository.get_or_create_participation(
-            event=event,
-            user=user,
-            reaction=callback_data.reaction
-        )
-
-        # Обновляем клавиатуру
-        current_reaction = await EventParticipantsRepository.get_user_reaction(event, user)
-        await update_event_keyboard(callback, event, translator, current_reaction)
+        # Обновляем клавиатуру по сохранённой реакции
+        await update_event_keyboard(callback, callback_data.event_id, translator, result.reaction)
 
         text = translator.get(key="reaction_selected", reaction=callback_data.reaction)
         await callback.answer(text=text)
-        logger.info(f"Пользователь {repr(user)} выбрал реакцию {callback_data.reaction} для события {repr(event)}")
+        logger.info(f"Пользователь {callback.from_user.id} выбрал реакцию {callback_data.reaction} "
+                    f"для события {callback_data.event_id}")
 
     except Exception as e:
         logger.error(f"Ошибка обработки реакции на событие: {e}")
@@ -77,13 +71,13 @@ async def handle_event_reaction(
 
 async def update_event_keyboard(
         callback: CallbackQuery,
-        event: Event,
+        event_id: int,
         translator: LocalizedTranslator,
         current_reaction: EventReaction = None
 ):
     """Обновление клавиатуры события с выделением выбранной опции"""
     try:
-        keyboard = get_event_reaction_keyboard(translator, event.id, current_reaction)
+        keyboard = get_event_reaction_keyboard(translator, event_id, current_reaction)
         await callback.message.edit_reply_markup(reply_markup=keyboard)
     except TelegramBadRequest:
         pass
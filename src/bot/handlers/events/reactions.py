@@ -2,7 +2,8 @@ from loguru import logger
 from aiogram import Router
 from aiogram.types import CallbackQuery
 
-from src.bot.db.models import Event, EventParticipant, User
+from src.bot.db.models import Event, User
+from src.bot.db.repositories.event_participants import EventParticipantsRepository
 from src.bot.misc.enums.event_reaction import EventReaction
 from src.bot.misc.callback_data.user import EventReactionCD
 from src.bot.localization.translator import LocalizedTranslator
@@ -19,7 +20,8 @@ async def handle_reaction_callback(
 ):
     """Обработка callback для реакций на события"""
     try:
-        # Получаем событие и пользователя
+        # Получаем событие и пользователя. Пользователь читается из БД, а не из кэша:
+        # одобрение могло измениться в другой реплике
         event = await Event.get_or_none(id=callback_data.event_id)
         user = await User.get_or_none(telegram_id=callback.from_user.id)
         
@@ -39,18 +41,13 @@ async def handle_reaction_callback(
             await callback.answer(translator.get("error_deadline_passed"), show_alert=True)
             return
         
-        # Обновляем или создаем реакцию
-        participation, created = await EventParticipant.get_or_create(
+        # Обновляем или создаем реакцию (и счётчики события)
+        await EventParticipantsRepository.set_reaction(
             event=event,
             user=user,
-            defaults={'reaction': callback_data.reaction}
+            reaction=callback_data.reaction
         )
         
-        if not created:
-            participation.reaction = callback_data.reaction
-            participation.reacted_at = callback.message.date
-            await participation.save()
-        
         # Отправляем подтверждение
         reaction_text = {
             EventReaction.GOING: translator.get("reaction_going"),
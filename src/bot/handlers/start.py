@@ -3,11 +3,13 @@ from aiogram import Router
 from aiogram.types import Message, User as TgUser
 from aiogram.filters import CommandStart, CommandObject
 
-from src.bot.db.repositories.users import UsersRepository
+from src.bot.db.models import User
+from src.bot.misc.enums.user_role import UserRole
 from src.bot.services.admin_actions_service import AdminActionService
 from src.bot.utils.functions.user import create_or_update_user
 from src.bot.localization.translator import LocalizedTranslator
 from src.bot.services.admin_notification_service import AdminNotificationService
+from src.bot.services import recipient_roster
 
 
 router = Router(name="user_start")
@@ -18,12 +20,13 @@ async def handle_start(
         message: Message,
         command: CommandObject,
         translator: LocalizedTranslator,
+        user: User | None,
 ) -> None:
     """Обработка команды /start"""
     tg_user = message.from_user
 
     # Обработка административных действий
-    if command.args and await UsersRepository.is_admin(tg_user.id):
+    if command.args and user and user.role == UserRole.ADMIN:
         await AdminActionService.handle_admin_deeplink(message, command.args, translator)
         return
 
@@ -35,6 +38,11 @@ async def _handle_user_start(message: Message, tg_user: TgUser, translator: Loca
     """Обработать старт для обычного пользователя"""
     is_created, user = await create_or_update_user(tg_user)
 
+    # /start снимает отметку о недоступности: одобренный пользователь снова получает рассылки
+    roster = recipient_roster.get()
+    if roster:
+        roster.sync_user(user)
+
     if is_created:
         await AdminNotificationService.notify_about_new_user(user, message.bot, translator)
         await message.answer(text=translator.get("start_welcome"))
@@ -274,8 +274,12 @@ broadcast_confirmation =
 
     {$message}
 
-    ⚠️ Это сообщение будет отправлено всем одобренным пользователям.
+    ⚠️ Это сообщение будет отправлено всем одобренным пользователям: {$count}.
 broadcast_started = ⏳ Начинаю рассылку... Это может занять некоторое время.
-broadcast_completed = ✅ Рассылка завершена! Отправлено сообщений: {$count}
+broadcast_completed =
+    { $retrying ->
+        [0] ✅ Рассылка завершена! Отправлено сообщений: {$count}
+       *[other] ✅ Рассылка завершена! Отправлено сообщений: {$count}, ещё {$retrying} будут отправлены повторно
+    }
 broadcast_cancelled = ❌ Рассылка отменена.
 button_cancel = ❌ Отменить
@@ -3,6 +3,7 @@ import os
 from fluent_compiler.bundle import FluentBundle
 from fluentogram import TranslatorHub, FluentTranslator, TranslatorRunner
 
+from src.bot.main.config import config
 from src.bot.misc.enums import LocaleEnum
 
 
@@ -35,8 +36,15 @@ class Translator:
             root_locale=root_locale,
         )
 
+        # Готовые переводчики по языкам (бандлы уже скомпилированы, создавать заново не нужно)
+        self._localized: dict[str | None, LocalizedTranslator] = {}
+
     def __call__(self, language: str, *args, **kwargs):
-        return LocalizedTranslator(translator=self.t_hub.get_translator_by_locale(locale=language))
+        localized = self._localized.get(language)
+        if localized is None:
+            localized = LocalizedTranslator(translator=self.t_hub.get_translator_by_locale(locale=language))
+            self._localized[language] = localized
+        return localized
 
 
 class LocalizedTranslator:
@@ -50,3 +58,23 @@ class LocalizedTranslator:
             if v is None or v == "":
                 kwargs[k] = "empty"
         return self.translator.get(key, **kwargs)
+
+
+# Общие для процесса переводчики по основному языку
+_translators: dict[str, Translator] = {}
+
+
+def get_translator(root_locale: str | None = None) -> Translator:
+    """Общий для процесса Translator: .ftl файлы читаются и компилируются один раз"""
+    root_locale = root_locale or config.bot.root_locale
+
+    translator = _translators.get(root_locale)
+    if translator is None:
+        translator = Translator(root_locale=root_locale)
+        _translators[root_locale] = translator
+    return translator
+
+
+def get_localized_translator(locale: str | None) -> LocalizedTranslator:
+    """Переводчик для языка пользователя из общего Translator"""
+    return get_translator()(language=locale)
@@ -2,6 +2,7 @@ from dotenv import load_dotenv
 from dataclasses import dataclass
 from typing import Self, Final
 from os import environ
+import re
 
 
 
@@ -27,6 +28,10 @@ class GoogleCalendarConfig:
     credentials_file: str
     calendar_id: str
     sync_interval_seconds: int
+    full_sync_interval_seconds: int = 3600
+    page_size: int = 250
+    api_timeout_seconds: float = 30
+    api_max_workers: int = 4
 
     @classmethod
     def load_from_env(cls) -> Self:
@@ -34,6 +39,49 @@ class GoogleCalendarConfig:
             credentials_file=environ["GOOGLE_CREDENTIALS_FILE"],
             calendar_id=environ["GOOGLE_CALENDAR_ID"],
             sync_interval_seconds=int(environ["GOOGLE_CALENDAR_SYNC_INTERVAL_SECONDS"] or 60),
+            full_sync_interval_seconds=int(environ.get("GOOGLE_CALENDAR_FULL_SYNC_INTERVAL_SECONDS") or 3600),
+            page_size=int(environ.get("GOOGLE_CALENDAR_PAGE_SIZE") or 250),
+            api_timeout_seconds=float(environ.get("GOOGLE_API_TIMEOUT_SECONDS") or 30),
+            api_max_workers=int(environ.get("GOOGLE_API_MAX_WORKERS") or 4),
+        )
+
+
+# Допустимый секрет вебхука по требованиям Telegram (заголовок X-Telegram-Bot-Api-Secret-Token)
+WEBHOOK_SECRET_PATTERN: Final = re.compile(r"[A-Za-z0-9_-]{1,256}")
+
+
+@dataclass(frozen=True, slots=True)
+class WebhookConfig:
+    url: str | None  # Публичный адрес бота (https://bot.example.com). Если не задан - используется polling
+    secret: str | None
+    path: str = "/webhook"
+    host: str = "0.0.0.0"
+    port: int = 8080
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url)
+
+    @property
+    def webhook_url(self) -> str:
+        return f"{self.url.rstrip('/')}{self.path}"
+
+    @classmethod
+    def load_from_env(cls) -> Self:
+        url = environ.get("WEBHOOK_URL") or None
+        secret = environ.get("WEBHOOK_SECRET") or None
+        # Без секрета любой, кто знает адрес, может присылать боту поддельные обновления
+        if url and not secret:
+            raise ValueError("WEBHOOK_SECRET обязателен, если задан WEBHOOK_URL")
+        if secret and not WEBHOOK_SECRET_PATTERN.fullmatch(secret):
+            raise ValueError("WEBHOOK_SECRET: от 1 до 256 символов A-Z, a-z, 0-9, _ и -")
+
+        return cls(
+            url=url,
+            secret=secret,
+            path=environ.get("WEBHOOK_PATH") or "/webhook",
+            host=environ.get("WEBHOOK_HOST") or "0.0.0.0",
+            port=int(environ.get("WEBHOOK_PORT") or 8080),
         )
 
 
@@ -65,6 +113,7 @@ class Config:
     bot: BotConfig
     postgresql: PostgresqlConfig
     google_calendar: GoogleCalendarConfig
+    webhook: WebhookConfig
 
     @classmethod
     def load_from_env(cls) -> Self:
@@ -72,6 +121,7 @@ class Config:
             bot=BotConfig.load_from_env(),
             postgresql=PostgresqlConfig.load_from_env(),
             google_calendar=GoogleCalendarConfig.load_from_env(),
+            webhook=WebhookConfig.load_from_env(),
         )
 
 
@@ -1,14 +1,18 @@
 import asyncio
+import signal
 
 from loguru import logger
 from aiogram.enums import ParseMode
 from aiogram import Bot, Dispatcher, Router
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.default import DefaultBotProperties
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
 
 from src.bot.main.config import Config, config
-from src.bot.localization.translator import Translator
+from src.bot.localization.translator import get_translator
 from src.bot.misc.middlewares.translator import TranslatorMiddleware
+from src.bot.misc.middlewares.user_context import UserContextMiddleware
+from src.bot.misc.fsm_storage import PostgresStorage
 from src.bot.db.engine import init_db, close_db
 from src.bot.handlers.start import (
     router as start_router,
@@ -18,19 +22,32 @@ from src.bot.handlers.admin.user_management import router as admin_user_manageme
 from src.bot.handlers.admin.events import router as admin_events
 from src.bot.handlers.admin.broadcast import router as admin_broadcast
 from src.bot.handlers.admin.menu import router as admin_menu
-from src.bot.services import calendar_sync_service
+from src.bot.services import (
+    calendar_sync_service, outbox_service, reminder_scheduler, recipient_roster, event_bus as event_bus_service
+)
+from src.bot.services.event_bus import EventCreated, EventRescheduled, EventCancelled, ReminderDue
 from src.bot.services.notification_service import NotificationService
+from src.bot.services.google_api_executor import google_api_executor
+from src.bot.services.leader_election import LeaderElector
 
 properties: DefaultBotProperties = DefaultBotProperties(parse_mode=ParseMode.HTML)
 bot: Bot = Bot(token=config.bot.token, default=properties)
 
-storage = MemoryStorage()
+storage = PostgresStorage()
 dp = Dispatcher(storage=storage)
 
+# Задачи, которые выполняет только ведущая реплика
+leader_tasks: list[asyncio.Task] = []
+
 
 def setup_handlers(dispatcher: Dispatcher) -> None:
     main_router = Router(name="main_router")
 
+    # register user context middleware (до переводчика: пользователь нужен для выбора языка)
+    user_context_middleware = UserContextMiddleware()
+    main_router.message.outer_middleware(user_context_middleware)
+    main_router.callback_query.outer_middleware(user_context_middleware)
+
     # register translator middleware
     translator_middleware = TranslatorMiddleware(root_locale=config.bot.root_locale)
     main_router.message.outer_middleware(translator_middleware)
@@ -74,6 +91,34 @@ def setup_handlers(dispatcher: Dispatcher) -> None:
     dispatcher.include_router(main_router)
 
 
+async def start_leader_tasks():
+    """Запуск фоновой синхронизации с Google Calendar и планировщика напоминаний"""
+    leader_tasks.append(asyncio.create_task(reminder_scheduler.get().start()))
+    leader_tasks.append(asyncio.create_task(calendar_sync_service.get().start_sync()))
+
+
+async def stop_leader_tasks():
+    calendar_sync = calendar_sync_service.get()
+    if calendar_sync:
+        await calendar_sync.stop_sync()
+
+    scheduler = reminder_scheduler.get()
+    if scheduler:
+        await scheduler.stop()
+
+    for task in leader_tasks:
+        task.cancel()
+    await asyncio.gather(*leader_tasks, return_exceptions=True)
+    leader_tasks.clear()
+
+
+leader_elector = LeaderElector(
+    postgresql=config.postgresql,
+    on_elected=start_leader_tasks,
+    on_revoked=stop_leader_tasks,
+)
+
+
 async def on_startup():
     # Регистрация хэндлеров
     setup_handlers(dp)
@@ -81,38 +126,125 @@ async def on_startup():
     # Регистрация моделей БД
     await init_db()
 
-    # Запуск фоновой синхронизации с Google Calendar
+    # Запуск обработчика очереди рассылок
+    outbox_worker = outbox_service.get_or_create(bot=bot)
+    asyncio.create_task(outbox_worker.start())
+
+    # Получатели рассылок в памяти: загружаются на каждой реплике, которая может начать рассылку
+    roster = recipient_roster.get_or_create()
+    try:
+        await roster.load()
+    except Exception as e:
+        logger.error(f"Не удалось загрузить получателей рассылок, рассылки будут читать их из БД: {e}")
+    asyncio.create_task(roster.start())
+
     notification_service = NotificationService(bot=bot)
-    calendar_sync = calendar_sync_service.get_or_create(
-        notification_service=notification_service, 
-        sync_timeout=config.google_calendar.sync_interval_seconds
+    event_bus = event_bus_service.get_or_create()
+    scheduler = reminder_scheduler.get_or_create(event_bus=event_bus)
+
+    # Подписчики доменных событий: рассылки и расписание напоминаний
+    event_bus.subscribe(EventCreated, notification_service.notify_new_event)
+    event_bus.subscribe(EventCreated, scheduler.schedule)
+    event_bus.subscribe(EventRescheduled, notification_service.notify_event_postponed)
+    event_bus.subscribe(EventRescheduled, scheduler.schedule)
+    event_bus.subscribe(EventCancelled, notification_service.notify_event_cancelled)
+    event_bus.subscribe(EventCancelled, lambda event: scheduler.unschedule(event.id))
+    event_bus.subscribe(ReminderDue, notification_service.send_event_reminders)
+    event_bus.start()
+
+    # Синхронизация с Google Calendar и напоминания выполняются только на ведущей реплике
+    calendar_sync_service.get_or_create(
+        event_bus=event_bus, 
+        sync_timeout=config.google_calendar.sync_interval_seconds,
+        full_sync_interval=config.google_calendar.full_sync_interval_seconds
     )
-    asyncio.create_task(calendar_sync.start_sync())
+    asyncio.create_task(leader_elector.start())
 
     logger.info("Бот запущен!")
 
 
 async def on_shutdown():
-    # Остановка фоновой синхронизации
-    calendar_sync = calendar_sync_service.get()
-    if calendar_sync:
-        await calendar_sync.stop_sync()
-    
+    # Остановка синхронизации и планировщика, освобождение роли ведущей реплики
+    await leader_elector.stop()
+
+    # Обработка оставшихся доменных событий
+    event_bus = event_bus_service.get()
+    if event_bus:
+        await event_bus.stop()
+
+    roster = recipient_roster.get()
+    if roster:
+        await roster.stop()
+
+    # Остановка обработчика очереди рассылок
+    outbox_worker = outbox_service.get()
+    if outbox_worker:
+        await outbox_worker.stop()
+
+    google_api_executor.shutdown()
     await close_db()
     logger.info("Бот остановлен!")
 
 
+async def set_webhook(bot: Bot, dispatcher: Dispatcher) -> None:
+    await bot.set_webhook(
+        url=config.webhook.webhook_url,
+        secret_token=config.webhook.secret,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+        drop_pending_updates=False,
+    )
+    logger.info(f"Webhook установлен: {config.webhook.webhook_url}")
+
+
+async def start_webhook(bot: Bot, dispatcher: Dispatcher) -> None:
+    """Приём обновлений через webhook: aiohttp-сервер, несколько реплик можно поставить за балансировщик"""
+    dispatcher.startup.register(set_webhook)
+
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dispatcher,
+        bot=bot,
+        secret_token=config.webhook.secret,
+        # Telegram сразу получает 200, обновление обрабатывается диспетчером в фоне
+        handle_in_background=True,
+        translator=get_translator(config.bot.root_locale),
+    ).register(app, path=config.webhook.path)
+    setup_application(app, dispatcher, bot=bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=config.webhook.host, port=config.webhook.port)
+    await site.start()
+    logger.info(f"Webhook-сервер запущен на {config.webhook.host}:{config.webhook.port}{config.webhook.path}")
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        await stop_event.wait()
+    finally:
+        # Вызывает on_shutdown диспетчера и закрывает сессию бота
+        await runner.cleanup()
+
+
 async def start_bot(bot: Bot, dispatcher: Dispatcher) -> None:
     dispatcher.startup.register(on_startup)
     dispatcher.shutdown.register(on_shutdown)
-    await bot.delete_webhook(drop_pending_updates=False)
 
     try:
+        if config.webhook.enabled:
+            await start_webhook(bot, dispatcher)
+            return
+
+        await bot.delete_webhook(drop_pending_updates=False)
+
         # Запускаем поллинг
         await dispatcher.start_polling(
             bot,
             close_bot_session=True,
-            translator=Translator(root_locale=config.bot.root_locale)
+            translator=get_translator(config.bot.root_locale)
         )
     except Exception as e:
         logger.exception(e)
@@ -32,9 +32,19 @@ class AdminMenuCallback(CallbackData, prefix="admin"):
     action: AdminSection
 
 
+class PageDirection(str, Enum):
+    """Направление перехода по страницам списка"""
+    NEXT = "n"
+    PREV = "p"
+
+
 class UserManagementCallback(CallbackData, prefix="user_mgmt"):
     section: UserSection
     page: int = 1
+    # Курсор keyset-пагинации: created_at (в микросекундах) и id крайнего пользователя соседней страницы
+    cursor_ts: int | None = None
+    cursor_id: int | None = None
+    direction: PageDirection = PageDirection.NEXT
 
 
 class UserActionCallback(CallbackData, prefix="user_action"):
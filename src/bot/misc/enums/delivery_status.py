@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class DeliveryStatus(str, Enum):
+    SENT = "sent"
+    # Временная ошибка (сеть, сервер Telegram, flood wait): отправку стоит повторить позже
+    TRANSIENT = "transient"
+    # Telegram отклонил само сообщение: повтор не поможет
+    REJECTED = "rejected"
+    # Получатель недоступен навсегда (заблокировал бота, удалил аккаунт)
+    UNREACHABLE = "unreachable"
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class EventChange(str, Enum):
+    """Тип изменения события при синхронизации с календарём"""
+    ETAG = "etag"
+    UPDATED = "updated"
+    POSTPONED = "postponed"
+    CANCELLED = "cancelled"
@@ -3,7 +3,9 @@ from typing import Any, Union, Dict
 from aiogram.filters import BaseFilter
 from aiogram.types import Message, CallbackQuery
 
+from src.bot.db.models import User
 from src.bot.db.repositories.users import UsersRepository
+from src.bot.misc.enums.user_role import UserRole
 
 
 class IsAdminFilter(BaseFilter):
@@ -11,5 +13,10 @@ class IsAdminFilter(BaseFilter):
     async def __call__(
             self, update: Union[Message, CallbackQuery], *args: Any, **kwargs: Any
     ) -> Union[bool, Dict[str, Any]]:
+        # Пользователь уже получен UserContextMiddleware
+        if "user" in kwargs:
+            user: User | None = kwargs["user"]
+            return bool(user) and user.role == UserRole.ADMIN
+
         user_id = update.from_user.id
         return await UsersRepository.is_admin(user_telegram_id=user_id)
@@ -0,0 +1,154 @@
+import asyncio
+import copy
+import time
+from typing import Any, Mapping
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from loguru import logger
+
+from src.bot.db.repositories.fsm import FSMRepository
+from src.bot.utils.cache import MISSING, TTLCache
+
+
+class PostgresStorage(BaseStorage):
+    """
+    Хранилище FSM в Postgres (таблица fsm_states) через соединение Tortoise.
+
+    Запись сквозная: set_state/set_data возвращаются только после сохранения в БД, поэтому
+    несколько процессов бота (polling или webhook) на одной БД сразу видят изменения друг друга.
+    Записи, сделанные одновременно (за один проход event loop), сохраняются одной транзакцией,
+    и все их вызовы ждут её.
+    Прочитанные записи кэшируются на cache_ttl секунд (middleware FSM читает состояние на каждом апдейте):
+    свои записи обновляют кэш сразу, записи других процессов видны не позже чем через cache_ttl.
+    Состояния, не менявшиеся дольше state_ttl секунд, удаляются.
+    """
+
+    def __init__(
+            self,
+            key_builder: KeyBuilder | None = None,
+            state_ttl: int = 7 * 24 * 3600,
+            cleanup_interval: float = 3600,
+            cache_ttl: float = 5,
+            cache_size: int = 10_000,
+    ):
+        self.key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+        self.state_ttl = state_ttl
+        self.cleanup_interval = cleanup_interval
+        # Изменения, ожидающие записи: последнее значение по ключу
+        self._pending_states: dict[str, str | None] = {}
+        self._pending_data: dict[str, dict[str, Any]] = {}
+        # Результат записи текущей пачки: его ждут все вызовы, попавшие в пачку
+        self._batch_future: asyncio.Future | None = None
+        self._flush_tasks: set[asyncio.Task] = set()
+        self._flush_lock = asyncio.Lock()
+        self._cleaned_at = time.monotonic()
+        # Кэш чтения: ключ -> (state, data)
+        self._cache: TTLCache[str, tuple[str | None, dict[str, Any]]] = TTLCache(cache_size, cache_ttl)
+        # Счётчик записей (растёт до и после записи): чтение, во время которого шла запись,
+        # не кэшируется - оно могло прочитать старые значения
+        self._write_count = 0
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key = self.key_builder.build(key)
+        self._pending_states[storage_key] = state.state if isinstance(state, State) else state
+        await self._wait_for_write()
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        state, _ = await self._get_record(self.key_builder.build(key))
+        return state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise DataNotDictLikeError(
+                f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            )
+        storage_key = self.key_builder.build(key)
+        self._pending_data[storage_key] = copy.deepcopy(data)
+        await self._wait_for_write()
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        _, data = await self._get_record(self.key_builder.build(key))
+        return copy.deepcopy(data)
+
+    async def close(self) -> None:
+        """Дождаться записи изменений, поставленных в очередь"""
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    async def _get_record(self, storage_key: str) -> tuple[str | None, dict[str, Any]]:
+        cached = self._cache.get(storage_key)
+        if cached is not MISSING:
+            return cached
+
+        write_count = self._write_count
+        record = await FSMRepository.get(storage_key)
+        value = (record.state, record.data) if record else (None, {})
+        if write_count == self._write_count:
+            self._cache.set(storage_key, value)
+        return value
+
+    async def _wait_for_write(self) -> None:
+        if self._batch_future is None:
+            self._batch_future = asyncio.get_running_loop().create_future()
+            # Задача запустится на следующем проходе event loop: к этому времени в пачку попадут
+            # все записи, сделанные конкурентно
+            task = asyncio.create_task(self._flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+        # Отмена ожидающего вызова не должна отменять запись всей пачки
+        await asyncio.shield(self._batch_future)
+
+    async def _flush(self) -> None:
+        # Пачки пишутся последовательно, чтобы более ранняя запись ключа не перезаписала более позднюю
+        async with self._flush_lock:
+            future, self._batch_future = self._batch_future, None
+            states, self._pending_states = self._pending_states, {}
+            data, self._pending_data = self._pending_data, {}
+            self._write_count += 1
+
+            try:
+                await FSMRepository.save(states, data)
+            except Exception as e:
+                for storage_key in states.keys() | data.keys():
+                    self._cache.invalidate(storage_key)
+                logger.error(f"Ошибка записи состояний FSM: {e}")
+                future.set_exception(e)
+                # Ошибку получают ожидающие вызовы; если все они отменены, asyncio не должен ругаться на неё
+                future.exception()
+            else:
+                self._update_cache(states, data)
+                future.set_result(None)
+            finally:
+                # Чтения, пересёкшиеся с записью с любой стороны, не попадут в кэш
+                self._write_count += 1
+
+        await self._cleanup_expired()
+
+    def _update_cache(self, states: dict[str, str | None], data: dict[str, dict[str, Any]]) -> None:
+        """Записанные значения попадают в кэш; если закэширована только другая половина записи - сбрасываем"""
+        for storage_key in states.keys() | data.keys():
+            cached = self._cache.get(storage_key)
+            if storage_key in states and storage_key in data:
+                self._cache.set(storage_key, (states[storage_key], data[storage_key]))
+            elif cached is MISSING:
+                continue
+            elif storage_key in states:
+                self._cache.set(storage_key, (states[storage_key], cached[1]))
+            else:
+                self._cache.set(storage_key, (cached[0], data[storage_key]))
+
+    async def _cleanup_expired(self) -> None:
+        now = time.monotonic()
+        if now - self._cleaned_at < self.cleanup_interval:
+            return
+
+        self._cleaned_at = now
+        try:
+            deleted = await FSMRepository.delete_expired(self.state_ttl)
+            if deleted:
+                logger.info(f"Удалено устаревших состояний FSM: {deleted}")
+        except Exception as e:
+            logger.error(f"Ошибка удаления устаревших состояний FSM: {e}")
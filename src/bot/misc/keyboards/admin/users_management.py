@@ -8,7 +8,6 @@ from src.bot.misc.callback_data.admin import (
     AdminSection,
     UserSection
 )
-from src.bot.db.repositories.admin import AdminRepository
 
 
 def get_user_management_keyboard(translator: LocalizedTranslator, stats: dict) -> InlineKeyboardMarkup:
@@ -38,36 +37,33 @@ def get_user_management_keyboard(translator: LocalizedTranslator, stats: dict) -
 
 def get_users_list_keyboard(
         translator: LocalizedTranslator,
-        section: UserSection,
-        page: int = 1,
-        total_users: int = 0
+        current: UserManagementCallback,
+        total_pages: int = 1,
+        prev_page: UserManagementCallback | None = None,
+        next_page: UserManagementCallback | None = None
 ) -> InlineKeyboardMarkup:
     """Клавиатура списка пользователей с пагинацией"""
     builder = InlineKeyboardBuilder()
 
-    # Пагинация (только если есть больше одной страницы)
-    total_pages = max(1, (total_users + AdminRepository.USERS_PER_PAGE - 1) // AdminRepository.USERS_PER_PAGE)
-
-    if total_pages > 1:
+    # Пагинация (только если есть соседние страницы)
+    nav_buttons = 0
+    if prev_page or next_page:
         # Кнопка "Назад"
-        if page > 1:
-            builder.button(
-                text="⬅️",
-                callback_data=UserManagementCallback(section=section, page=page - 1)
-            )
+        if prev_page:
+            builder.button(text="⬅️", callback_data=prev_page)
+            nav_buttons += 1
 
         # Информация о странице
         builder.button(
-            text=f"{page}/{total_pages}",
+            text=f"{current.page}/{total_pages}",
             callback_data="noop"
         )
+        nav_buttons += 1
 
         # Кнопка "Вперед"
-        if page < total_pages:
-            builder.button(
-                text="➡️",
-                callback_data=UserManagementCallback(section=section, page=page + 1)
-            )
+        if next_page:
+            builder.button(text="➡️", callback_data=next_page)
+            nav_buttons += 1
 
     # Основные кнопки
     builder.button(
@@ -76,15 +72,12 @@ def get_users_list_keyboard(
     )
     builder.button(
         text=translator.get("button_refresh"),
-        callback_data=UserManagementCallback(section=section, page=page)
+        callback_data=current
     )
 
-    if total_pages >= 3:  # Если есть пагинация
-        if page == 1 or page == total_pages:
-            builder.adjust(2, 2)
-        else:
-            builder.adjust(3, 2)
+    if nav_buttons:
+        builder.adjust(nav_buttons, 2)
     else:  # Если нет пагинации
         builder.adjust(2)
 
-    return builder.as_markup()
\ No newline at end of file
+    return builder.as_markup()
@@ -2,14 +2,21 @@ from typing import Callable, Dict, Any, Awaitable, Union
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
-from loguru import logger
 
-# from src.database.engine import get_async_session
-# from src.database.repo.user import UsersRepository
-from src.bot.localization.translator import Translator
+from src.bot.db.models import User
+from src.bot.misc.enums import LocaleEnum
+from src.bot.localization.translator import Translator, get_translator
+
+
+SUPPORTED_LOCALES: frozenset[str] = frozenset(LocaleEnum)
 
 
 class TranslatorMiddleware(BaseMiddleware):
+    """
+    Передаёт обработчикам переводчик на языке пользователя.
+    Язык берётся из пользователя, которого UserContextMiddleware уже получил из кэша, поэтому запросов к БД нет.
+    Переводчики по языкам создаются один раз и переиспользуются Translator
+    """
 
     def __init__(self, root_locale: str):
         self.root_locale: str = root_locale
@@ -20,31 +27,14 @@ class TranslatorMiddleware(BaseMiddleware):
             event: Union[Message, CallbackQuery],
             data: Dict[str, Any]
     ):
-        translator: Translator = data["translator"]
+        translator: Translator = data.get("translator") or get_translator(self.root_locale)
 
-        # ВРЕМЕННО
         new_data = data.copy()
-        new_data["translator"] = translator(language=self.root_locale)
+        new_data["translator"] = translator(language=self._get_locale(data.get("user")))
         return await handler(event, new_data)
 
-        async for session in get_async_session():
-            try:
-                # Получаем пользователя из БД
-                user_repo = UsersRepository(session=session)
-                user = await user_repo.get_user(telegram_id=event.from_user.id)
-
-                # Определяем язык
-                locale = user.language if user else self.root_locale
-
-                # Создаем копию данных с обновленным переводчиком
-                new_data = data.copy()
-                new_data["translator"] = translator(language=locale)
-
-                return await handler(event, new_data)
-
-            except Exception as e:
-                logger.error(f"Translation error: {e}")
-                # В случае ошибки используем язык по умолчанию
-                new_data = data.copy()
-                new_data["translator"] = translator(language=self.root_locale)
-                return await handler(event, new_data)
+    def _get_locale(self, user: User | None) -> str:
+        """Язык пользователя, если он поддерживается, иначе основной"""
+        if user and user.locale in SUPPORTED_LOCALES:
+            return user.locale
+        return self.root_locale
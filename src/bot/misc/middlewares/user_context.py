@@ -0,0 +1,23 @@
+from typing import Callable, Dict, Any, Awaitable, Union
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message, CallbackQuery, User as TgUser
+
+from src.bot.db.repositories.users import UsersRepository
+
+
+class UserContextMiddleware(BaseMiddleware):
+    """
+    Один раз за апдейт получает пользователя бота (из кэша UsersRepository) и передаёт его
+    фильтрам и обработчикам в data["user"]. Если пользователь не зарегистрирован - None
+    """
+
+    async def __call__(
+            self,
+            handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+            event: Union[Message, CallbackQuery],
+            data: Dict[str, Any]
+    ):
+        tg_user: TgUser | None = data.get("event_from_user")
+        data["user"] = await UsersRepository.get_cached_by_telegram_id(tg_user.id) if tg_user else None
+        return await handler(event, data)
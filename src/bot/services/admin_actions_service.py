@@ -3,13 +3,14 @@ from loguru import logger
 from aiogram.types import Message
 
 from src.bot.db.repositories.event_participants import EventParticipantsRepository
-from src.bot.misc.callback_data.admin import UserSection
+from src.bot.misc.callback_data.admin import UserSection, UserManagementCallback
 from src.bot.db.repositories.users import UsersRepository
 from src.bot.db.repositories.events import EventsRepository
 from src.bot.misc.enums.event_reaction import EventReaction
 from src.bot.services.deeplink_service import DeeplinkService
-from src.bot.localization.translator import LocalizedTranslator, Translator
+from src.bot.localization.translator import LocalizedTranslator, get_localized_translator
 from src.bot.services.notification_service import NotificationService
+from src.bot.services import recipient_roster
 from src.bot.misc.keyboards.user import get_event_reaction_keyboard
 from src.bot.utils.functions.user import get_user_link_str
 
@@ -75,7 +76,7 @@ class AdminActionService:
     ) -> None:
         """Показать раздел управления пользователями"""
         from src.bot.handlers.admin.user_management import show_users_section
-        await show_users_section(message, section, page=1, translator=translator)
+        await show_users_section(message, UserManagementCallback(section=section), translator=translator)
 
     @staticmethod
     def _parse_action_args(args: str) -> tuple[str | None, int | None]:
@@ -95,8 +96,20 @@ class AdminActionService:
 # Обработчики стандартных действий пользователей (approve, ban и т.д.)
 # ---------------------------------------------------------------
 
+def _update_roster(user, is_deleted: bool = False) -> None:
+    """Применить изменение статуса пользователя к составу получателей рассылок"""
+    roster = recipient_roster.get()
+    if not roster:
+        return
+    if is_deleted:
+        roster.remove(user.telegram_id)
+    else:
+        roster.sync_user(user)
+
+
 async def _handle_approve(user, bot: Bot, translator: LocalizedTranslator) -> str:
     await UsersRepository.approve_user(user)
+    _update_roster(user)
     await _send_user_notification(user, bot, translator.get("user_approved_notification"))
     name = DeeplinkService.get_user_link(name=user.name, telegram_id=user.telegram_id)
 
@@ -104,7 +117,7 @@ async def _handle_approve(user, bot: Bot, translator: LocalizedTranslator) -> st
         events = await EventsRepository.get_all_active()
         if events:
             notification_service = NotificationService(bot)
-            user_translator = Translator(root_locale="ru")(language=user.locale)
+            user_translator = get_localized_translator(user.locale)
             for event in events:
                 text = notification_service._format_new_event_text(event, user_translator)
                 if not text:
@@ -114,7 +127,6 @@ async def _handle_approve(user, bot: Bot, translator: LocalizedTranslator) -> st
                     chat_id=user.telegram_id,
                     text=text,
                     keyboard=keyboard,
-                    delay=0.05,
                 )
     except Exception as e:
         logger.warning(f"Не удалось отправить пользователю {user.telegram_id} список мероприятий: {e}")
@@ -124,12 +136,14 @@ async def _handle_approve(user, bot: Bot, translator: LocalizedTranslator) -> st
 
 async def _handle_reject(user, bot: Bot, translator: LocalizedTranslator) -> str:
     await UsersRepository.delete_user(user)
+    _update_roster(user, is_deleted=True)
     name = DeeplinkService.get_user_link(name=user.name, telegram_id=user.telegram_id)
     return translator.get("admin_action_completed_reject", name=name)
 
 
 async def _handle_ban(user, bot: Bot, translator: LocalizedTranslator) -> str:
     await UsersRepository.ban_user(user)
+    _update_roster(user)
     await _send_user_notification(user, bot, translator.get("user_banned_notification"))
     name = DeeplinkService.get_user_link(name=user.name, telegram_id=user.telegram_id)
     return translator.get("admin_action_completed_ban", name=name)
@@ -137,6 +151,7 @@ async def _handle_ban(user, bot: Bot, translator: LocalizedTranslator) -> str:
 
 async def _handle_unban(user, bot: Bot, translator: LocalizedTranslator) -> str:
     await UsersRepository.unban_user(user)
+    _update_roster(user)
     await _send_user_notification(user, bot, translator.get("user_unbanned_notification"))
     name = DeeplinkService.get_user_link(name=user.name, telegram_id=user.telegram_id)
     return translator.get("admin_action_completed_unban", name=name)
@@ -144,6 +159,7 @@ async def _handle_unban(user, bot: Bot, translator: LocalizedTranslator) -> str:
 
 async def _handle_delete(user, bot: Bot, translator: LocalizedTranslator) -> str:
     await UsersRepository.delete_user(user)
+    _update_roster(user, is_deleted=True)
     name = DeeplinkService.get_user_link(name=user.name, telegram_id=user.telegram_id)
     return translator.get("admin_action_completed_delete", name=name)
 
@@ -170,9 +186,13 @@ async def _handle_event_participants(event_id: int, bot: Bot, message: Message,
             await message.answer("❌ Событие не найдено")
             return
 
-        going = await EventParticipantsRepository.get_participants_by_reactions(event, [EventReaction.GOING])
-        not_going = await EventParticipantsRepository.get_participants_by_reactions(event, [EventReaction.NOT_GOING])
-        thinking = await EventParticipantsRepository.get_participants_by_reactions(event, [EventReaction.THINKING])
+        # Все участники с реакцией одним запросом
+        participants = await EventParticipantsRepository.get_participants_by_reactions(
+            event, [EventReaction.GOING, EventReaction.NOT_GOING, EventReaction.THINKING]
+        )
+        going = [p for p in participants if p.reaction == EventReaction.GOING]
+        not_going = [p for p in participants if p.reaction == EventReaction.NOT_GOING]
+        thinking = [p for p in participants if p.reaction == EventReaction.THINKING]
 
         going_list = "\n ".join([get_user_link_str(u.user) for u in going]) if going else "-"
         not_going_list = "\n ".join([get_user_link_str(u.user) for u in not_going]) if not_going else "-"
@@ -180,9 +200,9 @@ async def _handle_event_participants(event_id: int, bot: Bot, message: Message,
 
         text = (
             f"📅 <b>{event.title}</b>\n\n"
-            f"✅ Пойдут:\n {going_list}\n\n"
-            f"❌ Не пойдут:\n {not_going_list}\n\n"
-            f"🤔 Думают:\n {thinking_list}"
+            f"✅ Пойдут ({event.going_count}):\n {going_list}\n\n"
+            f"❌ Не пойдут ({event.not_going_count}):\n {not_going_list}\n\n"
+            f"🤔 Думают ({event.thinking_count}):\n {thinking_list}"
         )
 
         await message.answer(text, parse_mode="HTML")
@@ -1,23 +1,34 @@
 import asyncio
-from datetime import datetime, timezone
-from typing import Any, Final
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Final
 from loguru import logger
+from tortoise.transactions import in_transaction
 
-from src.bot.services.google_calendar import google_calendar_service
-from src.bot.services.notification_service import NotificationService
-from src.bot.db.models import Event
+from src.bot.services.google_calendar import google_calendar_service, EventsPage, SyncTokenExpiredError
+from src.bot.services.event_bus import EventBus, EventCreated, EventRescheduled, EventCancelled
+from src.bot.db.models import Event, CalendarSyncState
 from src.bot.misc.enums.event_status import EventStatus
+from src.bot.misc.enums.event_change import EventChange
 from src.bot.db.repositories.events import EventsRepository
+from src.bot.db.repositories.calendar_sync_state import CalendarSyncStateRepository
 
 
 class CalendarSyncService:
+    # Горизонт, в пределах которого создаются новые события
+    SYNC_WINDOW = timedelta(days=30)
+    # Поля, которые синхронизация записывает в существующие события
+    UPDATE_FIELDS = ("title", "description", "start_time", "end_time", "location", "status", "etag", "updated_at")
+
     def __init__(
         self, 
-        notification_service: NotificationService, 
-        sync_timeout: int = 60
+        event_bus: EventBus, 
+        sync_timeout: int = 60,
+        full_sync_interval: int = 3600
     ):
-        self.notification_service = notification_service
+        self.event_bus = event_bus
         self.sync_timeout = sync_timeout  # частота синхронизации
+        # Периодическая полная синхронизация: подхватывает события, попавшие в горизонт SYNC_WINDOW
+        self.full_sync_interval = full_sync_interval
         self.event_repo = EventsRepository
         self.is_running = False
 
@@ -44,9 +55,44 @@ class CalendarSyncService:
 
     # MAIN SYNC
     async def _sync_events(self):
-        """Основной метод: получает события, сверяет с БД, обрабатывает все изменения."""
-        # Полученные события из Google Calendar
-        google_events = await google_calendar_service.get_events()
+        """Основной метод: получает изменения событий, сверяет с БД, обрабатывает все изменения."""
+        calendar_id = google_calendar_service.calendar_id
+        state = await CalendarSyncStateRepository.get(calendar_id)
+        sync_token = state.sync_token if state and not self._is_full_sync_due(state) else None
+
+        # События из Google Calendar (только изменённые, если есть sync token) обрабатываются постранично
+        try:
+            next_sync_token = await self._reconcile_pages(
+                google_calendar_service.iter_event_pages(sync_token=sync_token)
+            )
+        except SyncTokenExpiredError:
+            logger.warning("Sync token устарел, выполняется полная синхронизация")
+            await CalendarSyncStateRepository.reset_sync_token(calendar_id)
+            sync_token = None
+            next_sync_token = await self._reconcile_pages(google_calendar_service.iter_event_pages())
+
+        # Токен сохраняется только после обработки: при сбое изменения будут запрошены снова
+        await CalendarSyncStateRepository.save_sync_token(
+            calendar_id, next_sync_token, full_sync=sync_token is None
+        )
+
+    async def _reconcile_pages(self, pages: AsyncIterator[EventsPage]) -> str | None:
+        """Сверка событий по мере загрузки страниц. Возвращает nextSyncToken последней страницы"""
+        next_sync_token = None
+        events_count = 0
+
+        async for page in pages:
+            await self._reconcile_events(page.items)
+            events_count += len(page.items)
+            next_sync_token = page.next_sync_token
+
+        logger.info(f"Обработано событий из календаря: {events_count}")
+        return next_sync_token
+
+    async def _reconcile_events(self, google_events: list[dict[str, Any]]) -> None:
+        """Сверка полученных событий с БД: все изменения страницы пишутся одной транзакцией"""
+        if not google_events:
+            return
 
         # События в базе
         google_event_ids: set[str] = {event["id"] for event in google_events}
@@ -57,41 +103,105 @@ class CalendarSyncService:
         }
 
         # Сверяем
+        now = datetime.now(tz=timezone.utc)
+        new_events: list[Event] = []
+        changed_events: list[Event] = []
+        changes: list[tuple[Event, EventChange]] = []
+
         for ge in google_events:
-            ge_id = ge["id"]
-            if ge_id in db_events_map:
-                await self._update_event(db_events_map[ge_id], ge)
-            else:
-                await self._create_event(ge)
+            local_event = db_events_map.get(ge["id"])
+            if local_event:
+                change = self._apply_update(local_event, ge)
+                if change:
+                    changed_events.append(local_event)
+                    changes.append((local_event, change))
+            elif self._is_creatable(ge, now):
+                new_events.append(self._build_event(ge))
+
+        if not new_events and not changed_events:
+            return
+
+        try:
+            async with in_transaction():
+                created_events = await self.event_repo.create_many(new_events)
+                await self.event_repo.update_many(changed_events, fields=self.UPDATE_FIELDS)
+        except Exception as e:
+            # Одно некорректное событие не должно блокировать страницу: иначе sync token не продвинется
+            # и каждая синхронизация будет падать на той же странице
+            logger.error(f"Ошибка сохранения страницы событий, события сохраняются по одному: {e}")
+            created_events, changes = await self._save_one_by_one(new_events, changes)
+
+        # События публикуются только после фиксации изменений, рассылки выполняют подписчики шины
+        for event in created_events:
+            logger.info(f"Создано новое событие: {event.title}")
+            await self.event_bus.publish(EventCreated(event))
+
+        for event, change in changes:
+            if change == EventChange.CANCELLED:
+                logger.info(f"Событие удалено из календаря: [{event.google_event_id}] {event.title}")
+                await self.event_bus.publish(EventCancelled(event))
+            elif change == EventChange.POSTPONED:
+                logger.info(f"Событие перенесено: {event.title}")
+                await self.event_bus.publish(EventRescheduled(event))
+            elif change == EventChange.UPDATED:
+                logger.info(f"Событие обновлено: {event.title}")
+
+    async def _save_one_by_one(
+            self,
+            new_events: list[Event],
+            changes: list[tuple[Event, EventChange]]
+    ) -> tuple[list[Event], list[tuple[Event, EventChange]]]:
+        """Сохранение событий по одному: ошибочные события пропускаются. Возвращает сохранённые"""
+        created_events: list[Event] = []
+        for event in new_events:
+            try:
+                created_events.extend(await self.event_repo.create_many([event]))
+            except Exception as e:
+                logger.error(f"Событие [{event.google_event_id}] не создано и пропущено: {e}")
 
-        await self.notification_service.send_reminders()
+        saved_changes: list[tuple[Event, EventChange]] = []
+        for event, change in changes:
+            try:
+                await self.event_repo.update_many([event], fields=self.UPDATE_FIELDS)
+                saved_changes.append((event, change))
+            except Exception as e:
+                logger.error(f"Событие [{event.google_event_id}] не обновлено и пропущено: {e}")
+
+        return created_events, saved_changes
+
+    def _is_full_sync_due(self, state: CalendarSyncState) -> bool:
+        if not state.full_synced_at:
+            return True
+        return datetime.now(tz=timezone.utc) - state.full_synced_at >= timedelta(seconds=self.full_sync_interval)
+
+    def _is_creatable(self, ge: dict[str, Any], now: datetime) -> bool:
+        """Новое событие создаётся, только если оно не отменено и попадает в окно синхронизации"""
+        if ge.get("status") == "cancelled":
+            return False
 
-    # CREATE / UPDATE / DELETE
-    async def _create_event(self, ge: dict[str, Any]) -> None:
-        """Создание нового события."""
         start = self._parse_gcal_datetime(ge.get("start"))
         end = self._parse_gcal_datetime(ge.get("end"))
+        if not start or not end:
+            return False
 
+        return end >= now and start <= now + self.SYNC_WINDOW
+
+    # CREATE / UPDATE / DELETE
+    def _build_event(self, ge: dict[str, Any]) -> Event:
+        """Новое событие (ещё не сохранённое) из события Google Calendar."""
         description = ge.get("description", "")
         parsed_cfg = google_calendar_service.parse_event_description(description)
 
-        event = await self.event_repo.create(
+        return Event(
             google_event_id=ge["id"],
-            title=ge.get("summary", "Без названия"),
+            title=self._fit("title", ge.get("summary", "Без названия")),
             description=description,
-            start_time=start,
-            end_time=end,
-            location=ge.get("location", ""),
+            start_time=self._parse_gcal_datetime(ge.get("start")),
+            end_time=self._parse_gcal_datetime(ge.get("end")),
+            location=self._fit("location", ge.get("location", "")),
             status=EventStatus.ACTIVE,
-        )
-
-        # если create() провалилось
-        if not event:
-            return
-
-        # JSON-поля
-        await self.event_repo.update(
-            event,
+            etag=self._fit("etag", ge.get("etag")),
+            # JSON-поля
             reminder_intervals=parsed_cfg.get("reminder_intervals", []),
             poll_interval=parsed_cfg.get("poll_interval", 24),
             deadline=self._parse_gcal_datetime(parsed_cfg.get("deadline"))
@@ -99,35 +209,35 @@ class CalendarSyncService:
             else None,
         )
 
-        logger.info(f"Создано новое событие: {event.title}")
-        await self.notification_service.notify_new_event(event)
-        
-    async def _cancel_event(self, local_event: Event):
-        """Удалить событие из БД + отправить уведомление"""
-        if local_event.status == EventStatus.CANCELLED:
-            return
-
-        await self.event_repo.update(local_event, status=EventStatus.CANCELLED)
-        await self.notification_service.notify_event_cancelled(local_event)
-        logger.info(f"Событие удалено из календаря: [{local_event.google_event_id}] {local_event.title}")
+    def _apply_update(self, local_event: Event, google_event: dict[str, Any]) -> EventChange | None:
+        """Применяет изменения из календаря к событию (без сохранения), возвращает тип изменения."""
+        # ETag не изменился - событие в календаре не менялось, сверять поля не нужно
+        new_etag = self._fit("etag", google_event.get("etag"))
+        if new_etag and new_etag == local_event.etag:
+            return None
 
-    async def _update_event(self, local_event: Event, google_event: dict[str, Any]):
-        """Обновляет существующее событие, возвращает изменения."""
-        update_data = {}
+        if new_etag:
+            local_event.etag = new_etag
 
         if google_event.get("status") == "cancelled":
-            await self._cancel_event(local_event)
-            return
+            if local_event.status == EventStatus.CANCELLED:
+                return EventChange.ETAG if new_etag else None
+            local_event.status = EventStatus.CANCELLED
+            return EventChange.CANCELLED
+
+        changed = False
 
         # ------------ title ------------
-        new_title = google_event.get("summary")
+        new_title = self._fit("title", google_event.get("summary"))
         if new_title and new_title != local_event.title:
-            update_data["title"] = new_title
+            local_event.title = new_title
+            changed = True
 
         # ------------ description ------------
         new_descr = google_event.get("description", "")
         if new_descr != local_event.description:
-            update_data["description"] = new_descr
+            local_event.description = new_descr
+            changed = True
 
         # ------------ datetime ------------
         new_start = self._parse_gcal_datetime(google_event.get("start"))
@@ -136,42 +246,39 @@ class CalendarSyncService:
         time_changed = False
 
         if new_start and new_start != local_event.start_time:
-            update_data["start_time"] = new_start
+            local_event.start_time = new_start
             time_changed = True
 
         if new_end and new_end != local_event.end_time:
-            update_data["end_time"] = new_end
+            local_event.end_time = new_end
             time_changed = True
 
         # ------------ location ------------
-        new_loc = google_event.get("location", "")
+        new_loc = self._fit("location", google_event.get("location", ""))
         if new_loc != local_event.location:
-            update_data["location"] = new_loc
+            local_event.location = new_loc
+            changed = True
 
         # ------------ JSON config ------------
-        parsed_cfg = google_calendar_service.parse_event_description(
-            google_event.get("description", "")
-        )
-
-        # update_data["reminder_intervals"] = parsed_cfg.get(
-        #     "reminder_intervals", local_event.reminder_intervals
-        # )
-        # update_data["poll_interval"] = parsed_cfg.get(
-        #     "poll_interval", local_event.poll_interval
-        # )
-
-        # if parsed_cfg.get("deadline"):
-        #     update_data["deadline"] = self._parse_gcal_datetime(parsed_cfg["deadline"])
-
-        # ------------ save if changed ------------
-        if update_data:
-            await self.event_repo.update(local_event, **update_data)
-
-            if time_changed:
-                logger.info(f"Событие перенесено: {local_event.title}")
-                await self.notification_service.notify_event_postponed(local_event)
-            else:
-                logger.info(f"Событие обновлено: {local_event.title}")
+        # parsed_cfg = google_calendar_service.parse_event_description(new_descr)
+        # local_event.reminder_intervals = parsed_cfg.get("reminder_intervals", local_event.reminder_intervals)
+        # local_event.poll_interval = parsed_cfg.get("poll_interval", local_event.poll_interval)
+
+        if time_changed:
+            return EventChange.POSTPONED
+        if changed:
+            return EventChange.UPDATED
+        # Поля не изменились (например, правка вне синхронизируемых полей) - запоминаем только ETag
+        return EventChange.ETAG if new_etag else None
+
+    @staticmethod
+    def _fit(field: str, value: str | None) -> str | None:
+        """Обрезка строки до max_length поля модели Event (Google Calendar ограничивает длину мягче)"""
+        max_length = Event._meta.fields_map[field].max_length
+        if value and len(value) > max_length:
+            logger.warning(f"Значение поля {field} события обрезано до {max_length} символов")
+            return value[:max_length]
+        return value
 
     # DATETIME PARSING
     def _parse_gcal_datetime(self, obj: dict | str | None) -> datetime | None:
@@ -211,12 +318,13 @@ class CalendarSyncService:
 calendar_sync_service: Final[CalendarSyncService] = None
 
 def get_or_create(
-    notification_service: NotificationService,
-    sync_timeout: int
+    event_bus: EventBus,
+    sync_timeout: int,
+    full_sync_interval: int = 3600
 ) -> CalendarSyncService:
     global calendar_sync_service
     if calendar_sync_service is None:
-        calendar_sync_service = CalendarSyncService(notification_service, sync_timeout)
+        calendar_sync_service = CalendarSyncService(event_bus, sync_timeout, full_sync_interval)
     return calendar_sync_service
 
 def get() -> CalendarSyncService | None:
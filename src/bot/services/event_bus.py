@@ -0,0 +1,158 @@
+import asyncio
+import inspect
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Final
+
+from loguru import logger
+
+from src.bot.db.models import Event
+
+
+# Доменные события синхронизации и планировщика
+@dataclass(frozen=True, slots=True)
+class EventCreated:
+    event: Event
+
+
+@dataclass(frozen=True, slots=True)
+class EventRescheduled:
+    event: Event
+
+
+@dataclass(frozen=True, slots=True)
+class EventCancelled:
+    event: Event
+
+
+@dataclass(frozen=True, slots=True)
+class ReminderDue:
+    event: Event
+
+
+DomainEvent = EventCreated | EventRescheduled | EventCancelled | ReminderDue
+Handler = Callable[[Event], Awaitable[None] | None]
+
+
+@dataclass(slots=True)
+class EventBusMetrics:
+    published: int = 0
+    # Вызовы подписчиков
+    handled: int = 0
+    failed: int = 0
+    # Сколько раз публикация ждала освобождения места в очереди
+    backpressure_waits: int = 0
+    # Максимальная задержка между публикацией и началом обработки за период
+    max_lag: float = 0.0
+
+
+class EventBus:
+    """
+    Очередь доменных событий внутри процесса.
+    Синхронизация только публикует события, рассылки выполняются отдельными обработчиками.
+    События одного мероприятия попадают в одну очередь и обрабатываются по порядку.
+    """
+
+    def __init__(self, maxsize: int = 1000, consumers: int = 2, metrics_interval: float = 60):
+        self.metrics = EventBusMetrics()
+        self.metrics_interval = metrics_interval
+        self._queues: list[asyncio.Queue[tuple[float, DomainEvent]]] = [
+            asyncio.Queue(maxsize=maxsize) for _ in range(consumers)
+        ]
+        self._handlers: dict[type, list[Handler]] = defaultdict(list)
+        self._tasks: list[asyncio.Task] = []
+
+    def subscribe(self, event_type: type, handler: Handler) -> None:
+        """Подписать обработчик (синхронный или асинхронный) на тип события"""
+        self._handlers[event_type].append(handler)
+
+    async def publish(self, domain_event: DomainEvent) -> None:
+        """Опубликовать событие. Если очередь заполнена, ждёт освобождения места"""
+        queue = self._queues[domain_event.event.id % len(self._queues)]
+        if queue.full():
+            self.metrics.backpressure_waits += 1
+            logger.warning(f"Очередь событий заполнена ({queue.qsize()}), публикация ожидает обработки")
+
+        await queue.put((time.monotonic(), domain_event))
+        self.metrics.published += 1
+
+    def start(self) -> None:
+        if self._tasks:
+            logger.warning("Обработчики событий уже запущены")
+            return
+
+        self._tasks = [asyncio.create_task(self._consume(queue)) for queue in self._queues]
+        self._tasks.append(asyncio.create_task(self._report_metrics()))
+        logger.info(f"Запуск обработчиков событий: {len(self._queues)}")
+
+    async def stop(self, drain_timeout: float = 10) -> None:
+        """Остановка: даёт обработчикам дообработать очередь, затем отменяет их"""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues)),
+                timeout=drain_timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Не обработано событий при остановке: {self.queue_depth}")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Остановка обработчиков событий")
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    async def _consume(self, queue: asyncio.Queue[tuple[float, DomainEvent]]) -> None:
+        while True:
+            published_at, domain_event = await queue.get()
+            self.metrics.max_lag = max(self.metrics.max_lag, time.monotonic() - published_at)
+
+            try:
+                await self._dispatch(domain_event)
+            finally:
+                queue.task_done()
+
+    async def _dispatch(self, domain_event: DomainEvent) -> None:
+        # Ошибка одного подписчика не мешает остальным
+        for handler in self._handlers.get(type(domain_event), ()):
+            try:
+                result = handler(domain_event.event)
+                if inspect.isawaitable(result):
+                    await result
+                self.metrics.handled += 1
+            except Exception as e:
+                self.metrics.failed += 1
+                logger.error(f"Ошибка обработки события {type(domain_event).__name__} "
+                             f"[{domain_event.event.id}]: {e}")
+
+    async def _report_metrics(self) -> None:
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+
+            metrics = self.metrics
+            if metrics.published or self.queue_depth:
+                logger.info(
+                    f"Очередь событий: опубликовано {metrics.published}, обработано {metrics.handled}, "
+                    f"ошибок {metrics.failed}, в очереди {self.queue_depth}, "
+                    f"ожиданий публикации {metrics.backpressure_waits}, макс. задержка {metrics.max_lag:.1f} с"
+                )
+            # Счётчики за период
+            self.metrics = EventBusMetrics()
+
+
+# SINGLETON
+event_bus: Final[EventBus] = None
+
+def get_or_create() -> EventBus:
+    global event_bus
+    if event_bus is None:
+        event_bus = EventBus()
+    return event_bus
+
+def get() -> EventBus | None:
+    global event_bus
+    return event_bus
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.http import HttpRequest
+
+from src.bot.main.config import config
+
+
+T = TypeVar("T")
+
+
+class GoogleApiExecutor:
+    """
+    Выполнение синхронных вызовов googleapiclient в отдельном пуле потоков,
+    чтобы ожидание HTTP не блокировало event loop бота.
+    """
+
+    def __init__(self, max_workers: int, timeout: float):
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="google-api")
+        # httplib2.Http не потокобезопасен: у каждого потока пула свой клиент
+        self._local = threading.local()
+
+    async def run(self, func: Callable[..., T], *args: Any, timeout: float | None = None, **kwargs: Any) -> T:
+        """Выполнить блокирующую функцию в пуле с таймаутом"""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+        return await asyncio.wait_for(future, timeout=timeout or self.timeout)
+
+    async def execute(self, request: HttpRequest, credentials) -> Any:
+        """Выполнить запрос googleapiclient (.execute()) в пуле"""
+        return await self.run(self._execute, request, credentials)
+
+    def _execute(self, request: HttpRequest, credentials) -> Any:
+        return request.execute(http=self._get_http(credentials))
+
+    def _get_http(self, credentials) -> AuthorizedHttp:
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = weakref.WeakKeyDictionary()
+
+        http = clients.get(credentials)
+        if http is None:
+            # Таймаут сокета, чтобы поток пула не зависал после отмены ожидания
+            http = AuthorizedHttp(credentials, http=httplib2.Http(timeout=self.timeout))
+            clients[credentials] = http
+        return http
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Глобальный экземпляр
+google_api_executor = GoogleApiExecutor(
+    max_workers=config.google_calendar.api_max_workers,
+    timeout=config.google_calendar.api_timeout_seconds,
+)
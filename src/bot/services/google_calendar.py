@@ -1,6 +1,8 @@
+import asyncio
 import json
-from datetime import datetime, timedelta, timezone
-from typing import Any
+from datetime import datetime, timezone
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
 
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
@@ -8,20 +10,34 @@ from googleapiclient.errors import HttpError
 from loguru import logger
 
 from src.bot.main.config import config
+from src.bot.services.google_api_executor import google_api_executor
+
+
+class SyncTokenExpiredError(Exception):
+    """sync token больше не действителен (410 Gone), нужна полная синхронизация"""
+
+
+@dataclass(frozen=True, slots=True)
+class EventsPage:
+    items: list[dict[str, Any]]
+    next_sync_token: str | None = None  # Есть только у последней страницы
 
 
 class GoogleCalendarService:
     SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
     
-    def __init__(self, calendar_id: str, credentials_file: str):
+    def __init__(self, calendar_id: str, credentials_file: str, page_size: int = 250):
         self.service = None
+        self.page_size = page_size  # maxResults для events().list
+        self.credentials = None
         self.calendar_id = calendar_id
         self.credentials_file = credentials_file
         
     async def authenticate(self):
         """Аутентификация с Google Calendar API"""
         try:
-            creds = service_account.Credentials.from_service_account_file(
+            creds = await google_api_executor.run(
+                service_account.Credentials.from_service_account_file,
                 filename=self.credentials_file,
                 scopes=self.SCOPES
             )
@@ -29,7 +45,8 @@ class GoogleCalendarService:
             if hasattr(config.google_calendar, 'delegated_user'):
                 creds = creds.with_subject(config.google_calendar.delegated_user)
             
-            self.service = build('calendar', 'v3', credentials=creds)
+            self.service = await google_api_executor.run(build, 'calendar', 'v3', credentials=creds)
+            self.credentials = creds
             logger.info("Успешная аутентификация Google Calendar API")
             
         except FileNotFoundError:
@@ -39,38 +56,71 @@ class GoogleCalendarService:
             logger.error(f"Ошибка аутентификации Google Calendar API: {e}")
             raise
     
-    async def get_events(self, time_min: datetime = None, time_max: datetime = None) -> list[dict[str, Any]]:
+    def iter_event_pages(
+            self,
+            sync_token: str | None = None,
+            time_min: datetime = None
+    ) -> AsyncIterator[EventsPage]:
+        """
+        Постраничное получение событий для синхронизации.
+        Без sync_token - полная выборка начиная с time_min, с sync_token - только изменения с прошлого запроса.
+        nextSyncToken для следующего запроса приходит в последней странице.
+        """
+        if sync_token:
+            return self._iter_pages(syncToken=sync_token)
+
+        # timeMax и orderBy несовместимы с последующей инкрементальной синхронизацией
+        time_min = time_min or datetime.now(tz=timezone.utc)
+        return self._iter_pages(timeMin=time_min.isoformat().replace('+00:00', 'Z'))
 
+    async def _iter_pages(self, **params: Any) -> AsyncIterator[EventsPage]:
+        """
+        Постраничный обход events().list.
+        Следующая страница запрашивается заранее, пока вызывающий код обрабатывает текущую.
+        """
         if not self.service:
             await self.authenticate()
-        
+
+        params = {
+            "calendarId": self.calendar_id,
+            "singleEvents": True,
+            "showDeleted": True,
+            "maxResults": self.page_size,
+            **params,
+        }
+
+        next_page = asyncio.create_task(self._fetch_page(params, page_token=None))
+        try:
+            while next_page:
+                events_result = await next_page
+                next_page = None
+
+                page_token = events_result.get('nextPageToken')
+                if page_token:
+                    next_page = asyncio.create_task(self._fetch_page(params, page_token=page_token))
+
+                yield EventsPage(
+                    items=events_result.get('items', []),
+                    next_sync_token=events_result.get('nextSyncToken'),
+                )
+        finally:
+            if next_page:
+                next_page.cancel()
+
+    async def _fetch_page(self, params: dict[str, Any], page_token: str | None) -> dict[str, Any]:
+        """Запрос одной страницы events().list"""
         try:
-            if not time_min:
-                time_min = datetime.now(tz=timezone.utc)
-            if not time_max:
-                time_max = time_min + timedelta(days=30)
+            request = self.service.events().list(pageToken=page_token, **params)
+            return await google_api_executor.execute(request, self.credentials)
 
-            time_min_str = time_min.isoformat().replace('+00:00', 'Z')
-            time_max_str = time_max.isoformat().replace('+00:00', 'Z')
-            
-            logger.info(f"Запрос событий: {time_min_str} → {time_max_str}")
-            
-            events_result = self.service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=time_min_str,
-                timeMax=time_max_str,
-                singleEvents=True,
-                orderBy='startTime',
-                showDeleted=True
-            ).execute()
-
-            events = events_result.get('items', [])
-            logger.info(f"Получено событий: {len(events)}")
-            return events
-            
         except HttpError as e:
+            if e.resp.status == 410:
+                raise SyncTokenExpiredError() from e
             logger.error(f"Ошибка получения событий: {e}")
             raise
+        except asyncio.TimeoutError:
+            logger.error("Таймаут запроса событий Google Calendar")
+            raise
 
     async def get_event_by_id(self, event_id: str) -> dict[str, Any] | None:
         """Получение конкретного события из Google Calendar"""
@@ -78,14 +128,17 @@ class GoogleCalendarService:
             await self.authenticate()
         
         try:
-            event = self.service.events().get(
+            request = self.service.events().get(
                 calendarId=self.calendar_id,
                 eventId=event_id
-            ).execute()
-            return event
+            )
+            return await google_api_executor.execute(request, self.credentials)
         except HttpError as e:
             logger.error(f"Ошибка получения события {event_id}: {e}")
             return None
+        except asyncio.TimeoutError:
+            logger.error(f"Таймаут получения события {event_id}")
+            return None
     
     def parse_event_description(self, description: str) -> dict[str, Any]:
         """Парсинг JSON внутри описания события"""
@@ -133,5 +186,6 @@ class GoogleCalendarService:
 # Глобальный экземпляр
 google_calendar_service = GoogleCalendarService(
     calendar_id=config.google_calendar.calendar_id,
-    credentials_file=config.google_calendar.credentials_file
+    credentials_file=config.google_calendar.credentials_file,
+    page_size=config.google_calendar.page_size
 )
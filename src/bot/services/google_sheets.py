@@ -8,44 +8,54 @@ from loguru import logger
 from src.bot.main.config import config
 from src.bot.db.models import Event, EventParticipant
 from src.bot.misc.enums.event_reaction import EventReaction
+from src.bot.services.google_api_executor import google_api_executor
 
 
 class GoogleSheetsService:
     SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+    # Интерактивная авторизация ждёт действий пользователя, поэтому для неё отдельный таймаут
+    AUTH_TIMEOUT_SECONDS = 300
     
     def __init__(self):
         self.service = None
+        self.credentials = None
         self.spreadsheet_id = config.google_calendar.sheets_id
         
     async def authenticate(self):
         """Аутентификация с Google Sheets API"""
         try:
-            creds = None
-            # Загружаем сохраненные учетные данные
-            try:
-                creds = Credentials.from_authorized_user_file('sheets_token.json', self.SCOPES)
-            except FileNotFoundError:
-                pass
-            
-            # Если нет действительных учетных данных, запрашиваем авторизацию
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
-                else:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        config.google_calendar.sheets_credentials_file, self.SCOPES)
-                    creds = flow.run_local_server(port=0)
-                
-                # Сохраняем учетные данные для следующего запуска
-                with open('sheets_token.json', 'w') as token:
-                    token.write(creds.to_json())
-            
-            self.service = build('sheets', 'v4', credentials=creds)
+            creds = await google_api_executor.run(self._load_credentials, timeout=self.AUTH_TIMEOUT_SECONDS)
+            self.service = await google_api_executor.run(build, 'sheets', 'v4', credentials=creds)
+            self.credentials = creds
             logger.info("Успешная аутентификация с Google Sheets API")
             
         except Exception as e:
             logger.error(f"Ошибка аутентификации с Google Sheets API: {e}")
             raise
+
+    def _load_credentials(self) -> Credentials:
+        """Загрузка учетных данных (блокирующая, выполняется в пуле потоков)"""
+        creds = None
+        # Загружаем сохраненные учетные данные
+        try:
+            creds = Credentials.from_authorized_user_file('sheets_token.json', self.SCOPES)
+        except FileNotFoundError:
+            pass
+        
+        # Если нет действительных учетных данных, запрашиваем авторизацию
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(
+                    config.google_calendar.sheets_credentials_file, self.SCOPES)
+                creds = flow.run_local_server(port=0)
+            
+            # Сохраняем учетные данные для следующего запуска
+            with open('sheets_token.json', 'w') as token:
+                token.write(creds.to_json())
+
+        return creds
     
     async def export_event_statistics(self, event: Event) -> bool:
         """Экспорт статистики события в Google Sheets"""
@@ -84,9 +94,9 @@ class GoogleSheetsService:
                 ["Дата окончания", event.end_time.strftime("%Y-%m-%d %H:%M")],
                 ["Место", event.location or "Не указано"],
                 ["", ""],
-                ["Пойдут", len(going_users)],
-                ["Не пойдут", len(not_going_users)],
-                ["Подумают", len(thinking_users)],
+                ["Пойдут", event.going_count],
+                ["Не пойдут", event.not_going_count],
+                ["Подумают", event.thinking_count],
                 ["", ""],
                 ["Список участников:"],
                 ["Пойдут:", ""],
@@ -110,12 +120,13 @@ class GoogleSheetsService:
                 'values': data
             }
             
-            result = self.service.spreadsheets().values().update(
+            request = self.service.spreadsheets().values().update(
                 spreadsheetId=self.spreadsheet_id,
                 range=range_name,
                 valueInputOption='RAW',
                 body=body
-            ).execute()
+            )
+            await google_api_executor.execute(request, self.credentials)
             
             logger.info(f"Статистика события {event.title} экспортирована в Google Sheets")
             return True
@@ -128,9 +139,10 @@ class GoogleSheetsService:
         """Создание нового листа в таблице"""
         try:
             # Проверяем, существует ли лист
-            spreadsheet = self.service.spreadsheets().get(
+            request = self.service.spreadsheets().get(
                 spreadsheetId=self.spreadsheet_id
-            ).execute()
+            )
+            spreadsheet = await google_api_executor.execute(request, self.credentials)
             
             existing_sheets = [sheet['properties']['title'] for sheet in spreadsheet['sheets']]
             
@@ -146,10 +158,11 @@ class GoogleSheetsService:
                     }]
                 }
                 
-                self.service.spreadsheets().batchUpdate(
+                request = self.service.spreadsheets().batchUpdate(
                     spreadsheetId=self.spreadsheet_id,
                     body=request_body
-                ).execute()
+                )
+                await google_api_executor.execute(request, self.credentials)
                 
                 logger.info(f"Создан новый лист: {sheet_name}")
             
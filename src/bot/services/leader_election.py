@@ -0,0 +1,130 @@
+import asyncio
+from typing import Awaitable, Callable
+
+import asyncpg
+from loguru import logger
+
+from src.bot.main.config import PostgresqlConfig
+
+
+# Ключ advisory lock, общий для всех реплик бота
+LEADER_LOCK_KEY = 7_316_422_190_451
+
+
+class LeaderElector:
+    """
+    Выбор ведущей реплики через advisory lock Postgres.
+    Блокировка держится, пока живо отдельное соединение: ведущий периодически проверяет его (продление аренды),
+    резервные реплики пытаются взять блокировку каждые retry_interval секунд.
+    """
+
+    def __init__(
+            self,
+            postgresql: PostgresqlConfig,
+            on_elected: Callable[[], Awaitable[None]],
+            on_revoked: Callable[[], Awaitable[None]],
+            lock_key: int = LEADER_LOCK_KEY,
+            renew_interval: float = 5,
+            retry_interval: float = 5,
+    ):
+        self.postgresql = postgresql
+        self.on_elected = on_elected
+        self.on_revoked = on_revoked
+        self.lock_key = lock_key
+        self.renew_interval = renew_interval
+        self.retry_interval = retry_interval
+        self.is_leader = False
+        self.is_running = False
+        self._connection: asyncpg.Connection | None = None
+        self._stopped = asyncio.Event()
+
+    async def start(self):
+        """Цикл выборов: захват блокировки или продление аренды"""
+        if self.is_running:
+            logger.warning("Выбор ведущей реплики уже запущен")
+            return
+
+        self.is_running = True
+        self._stopped.clear()
+        logger.info("Запуск выбора ведущей реплики")
+
+        while self.is_running:
+            try:
+                if self.is_leader:
+                    await self._renew()
+                else:
+                    await self._try_acquire()
+            except Exception as e:
+                logger.error(f"Ошибка выбора ведущей реплики: {e}")
+                await self._release()
+
+            await self._sleep(self.renew_interval if self.is_leader else self.retry_interval)
+
+    async def stop(self):
+        """Остановка: снимает роль ведущего и освобождает блокировку"""
+        self.is_running = False
+        self._stopped.set()
+        await self._release()
+        logger.info("Остановка выбора ведущей реплики")
+
+    async def _try_acquire(self) -> None:
+        if self._connection is None or self._connection.is_closed():
+            self._connection = await self._connect()
+
+        acquired = await asyncio.wait_for(
+            self._connection.fetchval("SELECT pg_try_advisory_lock($1)", self.lock_key),
+            timeout=self.renew_interval,
+        )
+        if not acquired:
+            return
+
+        self.is_leader = True
+        logger.info("Реплика выбрана ведущей")
+        await self.on_elected()
+
+    async def _renew(self) -> None:
+        """Проверка соединения, которое держит блокировку. Если оно потеряно - роль снимается"""
+        if self._connection is None or self._connection.is_closed():
+            raise ConnectionError("соединение с блокировкой потеряно")
+
+        await asyncio.wait_for(self._connection.fetchval("SELECT 1"), timeout=self.renew_interval)
+
+    async def _release(self) -> None:
+        if self.is_leader:
+            self.is_leader = False
+            logger.warning("Реплика больше не ведущая")
+            try:
+                await self.on_revoked()
+            except Exception as e:
+                logger.error(f"Ошибка остановки задач ведущей реплики: {e}")
+
+        # Закрытие соединения освобождает блокировку на стороне Postgres
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            try:
+                await asyncio.wait_for(connection.close(), timeout=self.renew_interval)
+            except Exception:
+                connection.terminate()
+
+    async def _connect(self) -> asyncpg.Connection:
+        return await asyncpg.connect(
+            user=self.postgresql.user,
+            password=self.postgresql.password,
+            host=self.postgresql.host,
+            port=self.postgresql.port,
+            database=self.postgresql.database,
+            timeout=self.renew_interval,
+            # Postgres быстро обнаруживает оборванное соединение упавшей реплики и снимает её блокировку
+            server_settings={
+                "application_name": "events-bot-leader",
+                "tcp_keepalives_idle": "5",
+                "tcp_keepalives_interval": "2",
+                "tcp_keepalives_count": "3",
+            },
+        )
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,261 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+    TelegramUnauthorizedError,
+)
+from aiogram.types import InlineKeyboardMarkup
+from loguru import logger
+
+from src.bot.misc.enums.delivery_status import DeliveryStatus
+
+
+# Лимиты Telegram Bot API: ~30 сообщений в секунду на бота и ~1 сообщение в секунду в один чат
+GLOBAL_MESSAGES_PER_SECOND = 30
+CHAT_MESSAGE_INTERVAL_SECONDS = 1.0
+
+# Количество одновременных запросов к Telegram при рассылке
+DEFAULT_CONCURRENCY = 16
+
+# Адаптивная частота отправки (AIMD): прирост в сообщениях/с за секунду успешной отправки,
+# множитель снижения при TelegramRetryAfter и запас ниже частоты, на которой пришёл 429
+RATE_ADDITIVE_INCREASE = 1.0
+RATE_MULTIPLICATIVE_DECREASE = 0.5
+RATE_CEILING_FACTOR = 0.9
+MIN_MESSAGES_PER_SECOND = 1.0
+# Как долго частота держится у потолка без 429, прежде чем потолок осторожно поднимается
+RATE_PROBE_INTERVAL_SECONDS = 60
+
+# Количество попыток отправки одного сообщения при TelegramRetryAfter
+RETRY_AFTER_ATTEMPTS = 2
+
+# Ответы Telegram на Bad Request, означающие, что чата больше нет
+UNREACHABLE_CHAT_ERRORS = ("chat not found", "peer_id_invalid", "user not found")
+
+
+@dataclass(frozen=True, slots=True)
+class OutgoingMessage:
+    chat_id: int
+    text: str
+    keyboard: InlineKeyboardMarkup | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class DeliveryResult:
+    status: DeliveryStatus
+    error: str | None = None
+
+    @property
+    def is_sent(self) -> bool:
+        return self.status == DeliveryStatus.SENT
+
+
+class TokenBucket:
+    """Глобальный лимит частоты отправки (token bucket)"""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Дождаться свободного токена"""
+        # Ожидающие выстраиваются в очередь на замке, поэтому токены выдаются по порядку
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket с частотой, подстраиваемой по ответам Telegram (AIMD).
+    Пока отправки успешны, частота растёт аддитивно, на TelegramRetryAfter - снижается в разы,
+    а все отправители, использующие bucket, ждут окончания flood wait.
+    Частота, на которой пришёл 429, запоминается как потолок (с запасом): дальше частота держится
+    чуть ниже него и лишь изредка пробует подняться, а не колеблется вокруг лимита
+    """
+
+    def __init__(
+            self,
+            max_rate: float,
+            min_rate: float = MIN_MESSAGES_PER_SECOND,
+            increase: float = RATE_ADDITIVE_INCREASE,
+            decrease: float = RATE_MULTIPLICATIVE_DECREASE,
+            ceiling_factor: float = RATE_CEILING_FACTOR,
+            probe_interval: float = RATE_PROBE_INTERVAL_SECONDS,
+    ):
+        super().__init__(rate=max_rate)
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.ceiling_factor = ceiling_factor
+        self.probe_interval = probe_interval
+        self._ceiling = max_rate
+        self._ceiling_reached_at = time.monotonic()
+        self._paused_until = 0.0
+
+    async def acquire(self) -> None:
+        """Дождаться окончания общей паузы и свободного токена"""
+        async with self._lock:
+            while (delay := self._paused_until - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+        await super().acquire()
+
+    def on_success(self) -> None:
+        """Аддитивное увеличение: примерно +increase сообщений/с за каждую секунду успешной отправки"""
+        now = time.monotonic()
+
+        if self.rate < self._ceiling:
+            self._set_rate(min(self._ceiling, self.rate + self.increase / self.rate))
+            if self.rate >= self._ceiling:
+                self._ceiling_reached_at = now
+
+        elif self._ceiling < self.max_rate and now - self._ceiling_reached_at >= self.probe_interval:
+            # Давно не было 429 - лимит мог вырасти, осторожно поднимаем потолок
+            self._ceiling = min(self.max_rate, self._ceiling + self.increase)
+            self._ceiling_reached_at = now
+
+    def on_retry_after(self, retry_after: float) -> None:
+        """Мультипликативное снижение частоты и общая пауза на время flood wait"""
+        now = time.monotonic()
+        paused_until = now + retry_after
+
+        # Одновременные отправки получают 429 на одно и то же превышение: частота снижается один раз
+        if now >= self._paused_until:
+            self._ceiling = max(self.min_rate, self.rate * self.ceiling_factor)
+            self._set_rate(max(self.min_rate, self.rate * self.decrease))
+            self._ceiling_reached_at = now
+            logger.warning(
+                f"Telegram flood wait {retry_after} с: пауза отправки, частота снижена до {self.rate:.1f} сообщений/с "
+                f"(потолок {self._ceiling:.1f})"
+            )
+
+        if paused_until > self._paused_until:
+            self._paused_until = paused_until
+            # За время паузы токены не накапливаются: после неё отправка начинается с текущей частоты, без всплеска
+            self._tokens = 0
+            self._updated_at = paused_until
+
+    def _set_rate(self, rate: float) -> None:
+        self.rate = rate
+        self.capacity = rate
+
+
+class ChatRateLimiter:
+    """Лимит частоты отправки в один чат"""
+
+    # Порог, после которого из словаря удаляются устаревшие записи
+    _CLEANUP_THRESHOLD = 10_000
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot: dict[int, float] = {}
+
+    async def acquire(self, chat_id: int) -> None:
+        """Зарезервировать ближайший слот для чата и дождаться его"""
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(chat_id, now))
+        self._next_slot[chat_id] = slot + self.interval
+
+        if len(self._next_slot) > self._CLEANUP_THRESHOLD:
+            self._cleanup(now)
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _cleanup(self, now: float) -> None:
+        self._next_slot = {
+            chat_id: slot
+            for chat_id, slot in self._next_slot.items()
+            if slot > now
+        }
+
+
+# Общие для всего процесса лимиты
+global_rate_limiter = AdaptiveTokenBucket(max_rate=GLOBAL_MESSAGES_PER_SECOND)
+chat_rate_limiter = ChatRateLimiter(interval=CHAT_MESSAGE_INTERVAL_SECONDS)
+
+
+class MessageSender:
+    """Отправка сообщений с ограниченной конкурентностью и соблюдением лимитов Telegram"""
+
+    def __init__(
+            self,
+            bot: Bot,
+            concurrency: int = DEFAULT_CONCURRENCY,
+            rate_limiter: AdaptiveTokenBucket = global_rate_limiter,
+            chat_limiter: ChatRateLimiter = chat_rate_limiter,
+    ):
+        self.bot = bot
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.chat_limiter = chat_limiter
+
+    async def send(self, message: OutgoingMessage) -> bool:
+        """Отправка одного сообщения с учётом лимитов"""
+        return (await self.deliver(message)).is_sent
+
+    async def deliver(self, message: OutgoingMessage) -> DeliveryResult:
+        """Отправка одного сообщения с учётом лимитов и классификацией ошибки"""
+        message_kwargs = {"chat_id": message.chat_id, "text": message.text}
+        if message.keyboard:
+            message_kwargs["reply_markup"] = message.keyboard
+
+        await self.chat_limiter.acquire(message.chat_id)
+
+        for attempt in range(1, RETRY_AFTER_ATTEMPTS + 1):
+            try:
+                # После TelegramRetryAfter acquire ждёт окончания общей паузы
+                await self.rate_limiter.acquire()
+                await self.bot.send_message(**message_kwargs)
+                self.rate_limiter.on_success()
+                return DeliveryResult(DeliveryStatus.SENT)
+
+            except TelegramRetryAfter as e:
+                # Ограничение частоты отправки: пауза и снижение частоты для всех отправителей
+                self.rate_limiter.on_retry_after(e.retry_after)
+                logger.warning(
+                    f"Rate limit exceeded for user {message.chat_id} (attempt {attempt}). "
+                    f"Retrying after {e.retry_after} seconds"
+                )
+
+            except Exception as e:
+                result = DeliveryResult(self.classify_error(e), str(e))
+                logger.warning(f"Failed to send message to user {message.chat_id} ({result.status.value}): {e}")
+                return result
+
+        logger.error(f"Failed to send message to user {message.chat_id} after {RETRY_AFTER_ATTEMPTS} attempts")
+        return DeliveryResult(DeliveryStatus.TRANSIENT, "flood wait")
+
+    @staticmethod
+    def classify_error(error: Exception) -> DeliveryStatus:
+        """Постоянная ли ошибка отправки: для получателя, для сообщения или временная"""
+        if isinstance(error, (TelegramUnauthorizedError, TelegramNotFound)):
+            # Проблема с токеном или адресом Bot API (404 - не найден метод/бот), а не с получателем.
+            # "chat not found" приходит как 400 и разбирается ниже
+            return DeliveryStatus.TRANSIENT
+        if isinstance(error, TelegramForbiddenError):
+            return DeliveryStatus.UNREACHABLE
+        if isinstance(error, TelegramBadRequest):
+            if any(text in error.message.lower() for text in UNREACHABLE_CHAT_ERRORS):
+                return DeliveryStatus.UNREACHABLE
+            return DeliveryStatus.REJECTED
+        # Сеть, ошибки сервера Telegram, таймауты
+        return DeliveryStatus.TRANSIENT
@@ -1,146 +1,165 @@
-import asyncio
-from typing import Callable
-from datetime import datetime
+from collections import Counter
+from typing import AsyncIterable, AsyncIterator, Callable
 
 from loguru import logger
-from aiogram.exceptions import TelegramRetryAfter
 
 from src.bot.db.models import Event
-from src.bot.localization.translator import Translator
+from src.bot.localization.translator import get_localized_translator
+from src.bot.db.repositories.admin import AdminRepository
 from src.bot.db.repositories.users import UsersRepository
 from src.bot.misc.enums.event_reaction import EventReaction
 from src.bot.misc.enums.notification_type import NotificationType
 from src.bot.misc.keyboards.user import get_event_reaction_keyboard
 from src.bot.db.repositories.event_participants import EventParticipantsRepository
 from src.bot.db.repositories.event_notifications import EventNotificationsRepository
+from src.bot.db.repositories.outbox import OutboxRepository
 from src.bot.utils.functions.dates import format_time
+from src.bot.services import outbox_service, recipient_roster
+from src.bot.services.message_sender import MessageSender, OutgoingMessage
+
+
+# Поток получателей: пачки пар (telegram_id, locale)
+Recipients = AsyncIterable[list[tuple[int, str | None]]]
 
 
 class NotificationService:
     def __init__(self, bot):
         self.bot = bot
+        self.sender = MessageSender(bot)
 
     async def _send_single_message_with_retry(
             self,
             chat_id: int,
             text: str,
-            keyboard: object | None = None,
-            delay: float = 0.05
+            keyboard: object | None = None
     ) -> bool:
         """
         Отправка одного сообщения
         """
+        return await self.sender.send(OutgoingMessage(chat_id=chat_id, text=text, keyboard=keyboard))
+
+    @staticmethod
+    def _approved_recipients() -> Recipients:
+        """Все получатели рассылок: из состава в памяти, а пока он не загружен - из БД"""
+        roster = recipient_roster.get()
+        if roster and roster.is_loaded:
+            return roster.iter_recipients()
+        return UsersRepository.iter_approved_recipients()
+
+    @staticmethod
+    async def get_recipients_count() -> int:
+        """Количество получателей рассылки (для подтверждения), без запроса к БД, если состав загружен"""
+        roster = recipient_roster.get()
+        if roster and roster.is_loaded:
+            return len(roster)
+        return await AdminRepository.get_users_count_by_section("approved")
+
+    @staticmethod
+    async def _recipients_from_users(users: list) -> AsyncIterator[list[tuple[int, str | None]]]:
+        """Получатели из уже загруженных пользователей (участники события) в формате потока получателей"""
+        yield [(user.telegram_id, user.locale) for user in users if user.unreachable_at is None]
+
+    @staticmethod
+    def _render(
+            locale: str | None,
+            text_formatter: Callable,
+            keyboard_builder: Callable | None
+    ) -> tuple[str, object | None] | None:
+        """Текст и клавиатура для языка или None, если подготовить сообщение не удалось"""
         try:
-            # Добавляем задержку между сообщениями
-            if delay > 0:
-                await asyncio.sleep(delay)
-
-            message_kwargs = {"chat_id": chat_id, "text": text}
-            if keyboard:
-                message_kwargs["reply_markup"] = keyboard
-
-            await self.bot.send_message(**message_kwargs)
-            return True
-
-        except TelegramRetryAfter as e:
-            # Обработка ограничения частоты отправки
-            retry_after = e.retry_after
-            logger.warning(f"Rate limit exceeded for user {chat_id}. Retrying after {retry_after} seconds")
-            await asyncio.sleep(retry_after)
-
-            # Повторная попытка отправки
-            try:
-                await self.bot.send_message(**message_kwargs)
-                return True
-            except Exception as retry_error:
-                logger.error(f"Failed to send message to user {chat_id} after retry: {retry_error}")
-                return False
+            # Переводчик из общего кэша, бандлы не пересобираются
+            translator = get_localized_translator(locale)
+
+            text = text_formatter(translator)
+            keyboard = keyboard_builder(translator) if keyboard_builder else None
 
         except Exception as e:
-            logger.warning(f"Failed to send message to user {chat_id}: {e}")
-            return False
+            logger.warning(f"Не удалось подготовить сообщение для языка {locale}: {e}")
+            return None
 
-    async def _notify_users_with_personal_locale(
-            self,
-            users: list,
-            event: Event,
-            notification_type: NotificationType,
-            text_formatter: Callable,
-            keyboard_builder: Callable | None,
-            log_message: str,
-            delay_between_messages: float = 0.05
-    ) -> None:
-        """Базовый метод для отправки уведомлений с персональной локализацией"""
-        sent_count = 0
-        failed_count = 0
+        if not text:
+            logger.error(f"Пустой текст уведомления для языка {locale}")
+            return None
 
-        await EventNotificationsRepository.create(event=event, notification_type=notification_type)
+        return text, keyboard
 
-        for user in users:
-            try:
-                # Используем глобальную функцию для получения переводчика
-                translator = Translator(root_locale="ru")(language=user.locale)
+    async def _render_by_locale(
+            self,
+            recipients: Recipients,
+            text_formatter: Callable,
+            keyboard_builder: Callable | None = None
+    ) -> AsyncIterator[OutgoingMessage]:
+        """
+        Выдача готовых сообщений по мере чтения получателей.
+        Текст и клавиатура рендерятся один раз на язык - при первом получателе с этим языком
+        """
+        rendered: dict[str | None, tuple[str, object | None] | None] = {}
+        skipped: Counter = Counter()
 
-                text = text_formatter(translator)
-                keyboard = keyboard_builder(translator) if keyboard_builder else None
+        async for chunk in recipients:
+            for chat_id, locale in chunk:
+                if locale not in rendered:
+                    rendered[locale] = self._render(locale, text_formatter, keyboard_builder)
 
-                if not text:
-                    logger.error(f"Пустой текст уведомления для пользователя {user.telegram_id}")
-                    failed_count += 1
+                message = rendered[locale]
+                if message is None:
+                    skipped[locale] += 1
                     continue
 
-                # Используем новый метод с обработкой retry и задержкой
-                success = await self._send_single_message_with_retry(
-                    chat_id=user.telegram_id,
-                    text=text,
-                    keyboard=keyboard,
-                    delay=delay_between_messages
-                )
+                text, keyboard = message
+                yield OutgoingMessage(chat_id=chat_id, text=text, keyboard=keyboard)
 
-                if success:
-                    sent_count += 1
-                else:
-                    failed_count += 1
+        for locale, count in skipped.items():
+            logger.warning(f"Сообщение для языка {locale} не отправлено {count} получателям")
 
-            except Exception as e:
-                logger.warning(f"Не удалось отправить уведомление пользователю {user.telegram_id}: {e}")
-                failed_count += 1
-
-        logger.info(f"Отправлено {sent_count} уведомлений о {log_message}. Не удалось: {failed_count}")
+    async def _notify_users_with_personal_locale(
+            self,
+            recipients: Recipients,
+            event: Event,
+            notification_type: NotificationType | None,
+            text_formatter: Callable,
+            keyboard_builder: Callable | None,
+            log_message: str
+    ) -> None:
+        """
+        Базовый метод для отправки уведомлений с персональной локализацией.
+        Без notification_type запись об уведомлении не создаётся (её уже сделал вызывающий код)
+        """
+        # Уведомление фиксируется до постановки сообщений: каждая вставленная пачка сразу видна обработчику
+        # очереди, и отправка начинается до конца чтения получателей. Уже вставленные пачки
+        # отправятся и после перезапуска
+        notification = None
+        if notification_type:
+            notification = await EventNotificationsRepository.create(event=event, notification_type=notification_type)
+        _, queued_count = await OutboxRepository.enqueue(
+            self._render_by_locale(recipients, text_formatter, keyboard_builder),
+            notification=notification,
+            on_batch=outbox_service.wake,
+        )
+        outbox_service.wake()
+        logger.info(f"В очередь поставлено {queued_count} уведомлений о {log_message}")
 
     async def _send_message_to_users_with_personal_locale(
             self,
-            users: list,
-            message_formatter: callable,
-            delay_between_messages: float = 0.05
-    ) -> int:
-        """Отправка сообщения списку пользователей с персональной локализацией"""
-        sent_count = 0
-        failed_count = 0
-
-        for user in users:
-            try:
-                translator = Translator(root_locale="ru")(language=user.locale)
-                text = message_formatter(translator)
-
-                # Используем новый метод с обработкой retry и задержкой
-                success = await self._send_single_message_with_retry(
-                    chat_id=user.telegram_id,
-                    text=text,
-                    delay=delay_between_messages
-                )
-
-                if success:
-                    sent_count += 1
-                else:
-                    failed_count += 1
-
-            except Exception as e:
-                logger.warning(f"Не удалось отправить сообщение пользователю {user.telegram_id}: {e}")
-                failed_count += 1
-
-        logger.info(f"Отправлено сообщений: {sent_count}, не удалось: {failed_count}")
-        return sent_count
+            recipients: Recipients,
+            message_formatter: callable
+    ) -> tuple[int, int]:
+        """
+        Отправка сообщения получателям с персональной локализацией.
+        Возвращает количество отправленных сообщений и ожидающих повтора после временной ошибки
+        """
+        # Обработчик очереди будится после каждой вставленной пачки: отправка начинается до конца чтения получателей
+        batch_id, queued_count = await OutboxRepository.enqueue(
+            self._render_by_locale(recipients, message_formatter),
+            on_batch=outbox_service.wake,
+        )
+        outbox_service.wake()
+
+        sent_count, failed_count, retrying_count = await outbox_service.wait_for_batch(batch_id)
+        logger.info(
+            f"Отправлено сообщений: {sent_count}, не удалось: {failed_count}, повтор позже: {retrying_count}"
+        )
+        return sent_count, retrying_count
 
     # Старый метод оставляем для обратной совместимости, но помечаем как deprecated
     async def _send_single_message(
@@ -151,14 +170,13 @@ class NotificationService:
     ) -> None:
         """Отправка одного сообщения (устаревший метод)"""
         logger.warning("Using deprecated _send_single_message method. Use _send_single_message_with_retry instead")
-        await self._send_single_message_with_retry(chat_id, text, keyboard, delay=0)
+        await self._send_single_message_with_retry(chat_id, text, keyboard)
 
     # Остальные методы класса остаются без изменений
     async def notify_new_event(self, event: Event) -> None:
         """Уведомление всех одобренных пользователей о новом событии"""
-        users = await UsersRepository.get_approved_users()
         await self._notify_users_with_personal_locale(
-            users=users,
+            recipients=self._approved_recipients(),
             event=event,
             notification_type=NotificationType.NEW_EVENT,
             text_formatter=lambda translator: self._format_new_event_text(event, translator),
@@ -175,7 +193,7 @@ class NotificationService:
         users = [participant.user for participant in participants]
 
         await self._notify_users_with_personal_locale(
-            users=users,
+            recipients=self._recipients_from_users(users),
             event=event,
             notification_type=NotificationType.CANCELLED,
             text_formatter=lambda translator: translator.get(
@@ -196,7 +214,7 @@ class NotificationService:
         users = [participant.user for participant in participants]
 
         await self._notify_users_with_personal_locale(
-            users=users,
+            recipients=self._recipients_from_users(users),
             event=event,
             notification_type=NotificationType.POSTPONED,
             text_formatter=lambda translator: translator.get(
@@ -209,25 +227,17 @@ class NotificationService:
             log_message=f"переносе события: {event.title}"
         )
 
-    async def send_reminders(self) -> None:
-        """Отправка напоминаний о событиях"""
-        active_events = await Event.filter(status="active")
-
-        for event in active_events:
-            if not await self._should_send_reminder(event):
-                continue
-
-            await self._send_event_reminders(event)
-
-    async def broadcast_message(self, message_text: str) -> int:
-        """Отправка сообщения всем одобренным пользователям"""
-        users = await UsersRepository.get_approved_users()
+    async def broadcast_message(self, message_text: str) -> tuple[int, int]:
+        """
+        Отправка сообщения всем одобренным пользователям.
+        Возвращает количество отправленных сообщений и ожидающих повтора
+        """
         return await self._send_message_to_users_with_personal_locale(
-            users=users,
+            recipients=self._approved_recipients(),
             message_formatter=lambda t: message_text,  # В рассылке текст одинаковый для всех
         )
 
-    async def _send_event_reminders(self, event: Event) -> None:
+    async def send_event_reminders(self, event: Event) -> None:
         """Отправка напоминаний для конкретного события"""
         thinking_participants = await EventParticipantsRepository.get_thinking_participants(event)
 
@@ -237,9 +247,10 @@ class NotificationService:
         users = [participant.user for participant in thinking_participants]
 
         await self._notify_users_with_personal_locale(
-            users=users,
+            recipients=self._recipients_from_users(users),
             event=event,
-            notification_type=NotificationType.REMINDER,
+            # Напоминание записывает в БД планировщик в момент обработки, в том числе без получателей
+            notification_type=None,
             text_formatter=lambda translator: translator.get(
                 "event_reminder_notification",
                 title=event.title,
@@ -250,20 +261,6 @@ class NotificationService:
             log_message=f"напоминании для события: {event.title}"
         )
 
-    async def _should_send_reminder(self, event: Event) -> bool:
-        """Проверяет, нужно ли отправлять напоминание для события"""
-        if not event.reminder_intervals:
-            return False
-
-        last_notification = await EventNotificationsRepository.get_last_reminder(event)
-
-        if last_notification:
-            time_since_last = datetime.now() - last_notification.sent_at
-            if time_since_last.total_seconds() < event.poll_interval * 3600:
-                return False
-
-        return True
-
     def _format_new_event_text(self, event: Event, translator) -> str:
         """Форматирует текст для нового события"""
         try:
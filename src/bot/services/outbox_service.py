@@ -0,0 +1,191 @@
+import asyncio
+import uuid
+from typing import Any, Final
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup
+from loguru import logger
+
+from src.bot.db.repositories.outbox import OutboxRepository
+from src.bot.db.repositories.users import UsersRepository
+from src.bot.misc.enums.delivery_status import DeliveryStatus
+from src.bot.services import recipient_roster
+from src.bot.services.message_sender import DeliveryResult, MessageSender, OutgoingMessage
+
+
+class OutboxWorker:
+    """
+    Фоновая отправка сообщений из таблицы notification_outbox.
+    Доставка "хотя бы один раз": отправка в Telegram и отметка sent не атомарны. Если процесс упал между ними,
+    строка остаётся в processing и через lease_seconds забирается снова - сообщения этой пачки уйдут повторно
+    """
+
+    def __init__(
+            self,
+            bot: Bot,
+            batch_size: int = 100,
+            poll_interval: float = 1.0,
+            lease_seconds: int = 300,
+            max_attempts: int = 5,
+            retry_base_delay: float = 30,
+            retry_max_delay: float = 3600,
+    ):
+        self.sender = MessageSender(bot)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval  # как часто проверять очередь, если нас не разбудили
+        self.lease_seconds = lease_seconds  # через сколько зависшие в processing строки забираются повторно
+        self.max_attempts = max_attempts  # после стольких временных ошибок сообщение уходит в failed
+        self.retry_base_delay = retry_base_delay  # задержка первого повтора, дальше удваивается
+        self.retry_max_delay = retry_max_delay
+        self.is_running = False
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.sender.concurrency)
+
+    async def start(self):
+        """Бесконечный цикл разбора очереди"""
+        if self.is_running:
+            logger.warning("Обработчик очереди рассылок уже запущен")
+            return
+
+        self.is_running = True
+        logger.info("Запуск обработчика очереди рассылок")
+
+        while self.is_running:
+            try:
+                processed = await self._process_batch()
+            except Exception as e:
+                logger.error(f"Ошибка обработки очереди рассылок: {e}")
+                processed = 0
+
+            if not processed:
+                await self._wait_for_work()
+
+    async def stop(self):
+        self.is_running = False
+        self._wakeup.set()
+        logger.info("Остановка обработчика очереди рассылок")
+
+    def wake(self) -> None:
+        """Разбудить обработчик после постановки новых сообщений"""
+        self._wakeup.set()
+
+    async def _wait_for_work(self) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _process_batch(self) -> int:
+        """Захватить и отправить одну пачку сообщений. Возвращает размер пачки"""
+        rows = await OutboxRepository.claim_batch(self.batch_size, self.lease_seconds)
+        if not rows:
+            return 0
+
+        results = await asyncio.gather(*(self._send_row(row) for row in rows))
+
+        sent_ids: list[int] = []
+        retry_errors: dict[int, str | None] = {}
+        failed_errors: dict[int, str | None] = {}
+        unreachable_chat_ids: list[int] = []
+
+        for row, result in zip(rows, results):
+            if result.status == DeliveryStatus.SENT:
+                sent_ids.append(row["id"])
+            elif result.status == DeliveryStatus.TRANSIENT and row["attempts"] < self.max_attempts:
+                retry_errors[row["id"]] = result.error
+            else:
+                # Постоянная ошибка или исчерпаны попытки: сообщение остаётся в таблице как dead letter
+                failed_errors[row["id"]] = f"{result.status.value}: {result.error}"
+                if result.status == DeliveryStatus.UNREACHABLE:
+                    unreachable_chat_ids.append(row["chat_id"])
+
+        await OutboxRepository.mark_sent(sent_ids)
+        await OutboxRepository.schedule_retry(retry_errors, self.retry_base_delay, self.retry_max_delay)
+        await OutboxRepository.mark_failed(failed_errors)
+        await self._handle_unreachable(unreachable_chat_ids)
+
+        logger.debug(
+            f"Обработана пачка рассылки: отправлено {len(sent_ids)}, повтор позже {len(retry_errors)}, "
+            f"не удалось {len(failed_errors)}"
+        )
+        return len(rows)
+
+    async def _send_row(self, row: dict[str, Any]) -> DeliveryResult:
+        keyboard = InlineKeyboardMarkup.model_validate(row["reply_markup"]) if row["reply_markup"] else None
+        message = OutgoingMessage(chat_id=row["chat_id"], text=row["text"], keyboard=keyboard)
+
+        async with self._semaphore:
+            return await self.sender.deliver(message)
+
+    @staticmethod
+    async def _handle_unreachable(chat_ids: list[int]) -> None:
+        """Исключить недоступных получателей из следующих рассылок и снять их сообщения с очереди"""
+        if not chat_ids:
+            return
+
+        marked = await UsersRepository.mark_unreachable(chat_ids)
+        skipped = await OutboxRepository.fail_pending_for_chats(chat_ids, DeliveryStatus.UNREACHABLE.value)
+
+        roster = recipient_roster.get()
+        if roster:
+            for chat_id in chat_ids:
+                roster.remove(chat_id)
+
+        logger.info(f"Недоступных получателей: {marked}, снято с очереди их сообщений: {skipped}")
+
+
+async def wait_for_batch(
+        batch_id: uuid.UUID,
+        poll_interval: float = 2.0,
+        timeout: float = 600,
+) -> tuple[int, int, int]:
+    """
+    Дождаться первой попытки отправки каждого сообщения рассылки. Повторы после временных ошибок
+    не ждём: они идут с растущей задержкой и могут занять часы.
+    Возвращает количество отправленных, неотправленных и ожидающих повтора сообщений.
+    Если за timeout секунд первые попытки не закончились (например, обработчик очереди не запущен),
+    возвращает последнее прочитанное количество - оставшиеся сообщения отправятся позже.
+    Ошибки чтения статуса повторяются до дедлайна; если статус так ни разу и не прочитан, ошибка пробрасывается
+    """
+    deadline = asyncio.get_running_loop().time() + timeout
+    progress: dict[str, int] | None = None
+    while True:
+        try:
+            progress = await OutboxRepository.get_batch_progress(batch_id)
+        except Exception as e:
+            # Сбой чтения не значит, что рассылка закончилась: пробуем снова до дедлайна
+            logger.error(f"Ошибка получения статуса рассылки {batch_id}: {e}")
+            if asyncio.get_running_loop().time() >= deadline and progress is None:
+                raise
+        else:
+            if not progress["awaiting"]:
+                return progress["sent"], progress["failed"], progress["retrying"]
+
+        if asyncio.get_running_loop().time() >= deadline:
+            logger.warning(
+                f"Рассылка {batch_id} не завершилась за {timeout} с: "
+                f"ещё не отправлялось {progress['awaiting']} сообщений"
+            )
+            return progress["sent"], progress["failed"], progress["retrying"] + progress["awaiting"]
+
+        await asyncio.sleep(poll_interval)
+
+
+# SINGLETON
+outbox_worker: Final[OutboxWorker] = None
+
+def get_or_create(bot: Bot) -> OutboxWorker:
+    global outbox_worker
+    if outbox_worker is None:
+        outbox_worker = OutboxWorker(bot)
+    return outbox_worker
+
+def get() -> OutboxWorker | None:
+    global outbox_worker
+    return outbox_worker
+
+def wake() -> None:
+    """Разбудить локальный обработчик очереди, если он запущен в этом процессе"""
+    if outbox_worker is not None:
+        outbox_worker.wake()
@@ -0,0 +1,135 @@
+import asyncio
+from array import array
+from bisect import bisect_left
+from typing import AsyncIterator, Final
+
+from loguru import logger
+
+from src.bot.db.models import User
+from src.bot.db.repositories.users import UsersRepository
+
+
+class RecipientRoster:
+    """
+    Получатели рассылок (одобренные, не забаненные и доступные пользователи), загруженные в память процесса.
+    Telegram ID хранятся в отсортированных массивах array('q') по языкам: 8 байт на получателя.
+    Изменения статуса пользователей из админки применяются сразу, изменения в других репликах
+    подтягиваются полной перезагрузкой раз в refresh_interval секунд
+    """
+
+    def __init__(self, refresh_interval: float = 300, chunk_size: int = 1000):
+        self.refresh_interval = refresh_interval
+        self.chunk_size = chunk_size
+        self.is_loaded = False
+        self.is_running = False
+        self._by_locale: dict[str | None, array] = {}
+        # Изменения, пришедшие во время загрузки: применяются к загруженному составу, чтобы не потеряться
+        self._changes_during_load: list[tuple[int, str | None, bool]] | None = None
+        self._stopped = asyncio.Event()
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._by_locale.values())
+
+    def counts_by_locale(self) -> dict[str | None, int]:
+        return {locale: len(ids) for locale, ids in self._by_locale.items()}
+
+    async def load(self) -> None:
+        """Полная загрузка получателей из БД. Текущий состав заменяется целиком после загрузки"""
+        by_locale: dict[str | None, array] = {}
+        self._changes_during_load = []
+        try:
+            async for chunk in UsersRepository.iter_approved_recipients(self.chunk_size):
+                for telegram_id, locale in chunk:
+                    by_locale.setdefault(locale, array("q")).append(telegram_id)
+        finally:
+            changes, self._changes_during_load = self._changes_during_load, None
+
+        # Получатели читаются по id, а поиск в массивах идёт по telegram_id
+        self._by_locale = {locale: array("q", sorted(ids)) for locale, ids in by_locale.items()}
+        for telegram_id, locale, is_added in changes:
+            if is_added:
+                self.add(telegram_id, locale)
+            else:
+                self.remove(telegram_id)
+        self.is_loaded = True
+        logger.info(f"Загружено получателей рассылок: {len(self)}")
+
+    async def start(self):
+        """Периодическая перезагрузка состава"""
+        if self.is_running:
+            logger.warning("Обновление получателей рассылок уже запущено")
+            return
+
+        self.is_running = True
+        self._stopped.clear()
+
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            if not self.is_running:
+                break
+
+            try:
+                await self.load()
+            except Exception as e:
+                logger.error(f"Ошибка обновления получателей рассылок: {e}")
+
+    async def stop(self):
+        self.is_running = False
+        self._stopped.set()
+
+    def sync_user(self, user: User) -> None:
+        """Добавление или удаление пользователя по его текущему статусу"""
+        if user.is_approved and not user.is_banned and user.unreachable_at is None:
+            self.add(user.telegram_id, user.locale)
+        else:
+            self.remove(user.telegram_id)
+
+    def add(self, telegram_id: int, locale: str | None) -> None:
+        if self._changes_during_load is not None:
+            self._changes_during_load.append((telegram_id, locale, True))
+
+        # Пользователь мог сменить язык - удаляем из других групп
+        self._remove(telegram_id)
+
+        ids = self._by_locale.setdefault(locale, array("q"))
+        ids.insert(bisect_left(ids, telegram_id), telegram_id)
+
+    def remove(self, telegram_id: int) -> None:
+        if self._changes_during_load is not None:
+            self._changes_during_load.append((telegram_id, None, False))
+        self._remove(telegram_id)
+
+    def _remove(self, telegram_id: int) -> None:
+        for ids in self._by_locale.values():
+            index = bisect_left(ids, telegram_id)
+            if index < len(ids) and ids[index] == telegram_id:
+                del ids[index]
+                return
+
+    async def iter_recipients(self) -> AsyncIterator[list[tuple[int, str | None]]]:
+        """
+        Получатели пачками пар (telegram_id, locale), как UsersRepository.iter_approved_recipients.
+        Рассылка идёт по копии массивов, поэтому изменения состава во время рассылки её не затрагивают
+        """
+        snapshot = [(locale, array("q", ids)) for locale, ids in self._by_locale.items()]
+        for locale, ids in snapshot:
+            for start in range(0, len(ids), self.chunk_size):
+                yield [(telegram_id, locale) for telegram_id in ids[start:start + self.chunk_size]]
+
+
+# SINGLETON
+recipient_roster: Final[RecipientRoster] = None
+
+def get_or_create() -> RecipientRoster:
+    global recipient_roster
+    if recipient_roster is None:
+        recipient_roster = RecipientRoster()
+    return recipient_roster
+
+def get() -> RecipientRoster | None:
+    global recipient_roster
+    return recipient_roster
@@ -0,0 +1,179 @@
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Final
+
+from loguru import logger
+
+from src.bot.db.models import Event
+from src.bot.db.repositories.events import EventsRepository
+from src.bot.db.repositories.event_notifications import EventNotificationsRepository
+from src.bot.misc.enums.event_status import EventStatus
+from src.bot.misc.enums.notification_type import NotificationType
+from src.bot.services.event_bus import EventBus, ReminderDue
+
+
+class ReminderScheduler:
+    """
+    Планировщик напоминаний по reminder_intervals событий.
+    Время ближайшего напоминания каждого события хранится в куче, цикл спит до ближайшего из них.
+    """
+
+    # Максимальное время сна, чтобы расхождение часов не откладывало напоминания надолго
+    MAX_SLEEP_SECONDS = 3600
+    # Через сколько повторить напоминание, если его не удалось записать в БД
+    RETRY_DELAY_SECONDS = 60
+
+    def __init__(self, event_bus: EventBus):
+        self.event_bus = event_bus
+        self.is_running = False
+        self._heap: list[tuple[datetime, int]] = []
+        # Актуальное время напоминания по событию: записи кучи, не совпадающие с ним, устарели
+        self._due: dict[int, datetime] = {}
+        # Время последнего обработанного напоминания по событию (как записано в БД)
+        self._last_sent: dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+
+    async def start(self):
+        """Загрузка расписания из БД и цикл отправки напоминаний"""
+        if self.is_running:
+            logger.warning("Планировщик напоминаний уже запущен")
+            return
+
+        self.is_running = True
+        logger.info("Запуск планировщика напоминаний")
+
+        try:
+            await self._load()
+        except Exception as e:
+            logger.error(f"Ошибка загрузки расписания напоминаний: {e}")
+
+        while self.is_running:
+            try:
+                await self._run_due()
+            except Exception as e:
+                logger.error(f"Ошибка отправки напоминаний: {e}")
+
+            await self._wait_for_next()
+
+    async def stop(self):
+        self.is_running = False
+        self._wakeup.set()
+        logger.info("Остановка планировщика напоминаний")
+
+    def schedule(self, event: Event) -> None:
+        """Пересчитать напоминание события (после создания или изменения)"""
+        due_at = self.next_reminder_at(event, self._last_sent.get(event.id), datetime.now(tz=timezone.utc))
+        if due_at is None:
+            self.unschedule(event.id)
+            return
+
+        if self._due.get(event.id) == due_at:
+            return
+
+        self._due[event.id] = due_at
+        heapq.heappush(self._heap, (due_at, event.id))
+        self._wakeup.set()
+
+    def unschedule(self, event_id: int) -> None:
+        """Снять напоминания события. Запись в куче удаляется лениво"""
+        self._due.pop(event_id, None)
+        self._last_sent.pop(event_id, None)
+
+    @staticmethod
+    def next_reminder_at(event: Event, last_sent_at: datetime | None, now: datetime) -> datetime | None:
+        """
+        Время следующего напоминания: ближайшая ещё не отправленная отметка start_time - interval.
+        Пропущенные (например, пока бот был выключен) отметки отправляются одним напоминанием сразу.
+        """
+        if event.status != EventStatus.ACTIVE or not event.reminder_intervals:
+            return None
+
+        since = last_sent_at or event.created_at
+        due_times = sorted(
+            event.start_time - timedelta(minutes=minutes)
+            for minutes in event.reminder_intervals
+            if isinstance(minutes, (int, float)) and minutes > 0
+        )
+        pending = [due_at for due_at in due_times if (since is None or due_at > since) and due_at < event.start_time]
+        if not pending:
+            return None
+
+        missed = [due_at for due_at in pending if due_at <= now]
+        return missed[-1] if missed else pending[0]
+
+    async def _load(self) -> None:
+        """Восстановление расписания: предстоящие события и время их последних напоминаний"""
+        now = datetime.now(tz=timezone.utc)
+        self._heap = []
+        self._due = {}
+
+        events = await EventsRepository.get_upcoming_active(now)
+        events = [event for event in events if event.reminder_intervals]
+        self._last_sent = await EventNotificationsRepository.get_last_reminders([event.id for event in events])
+
+        for event in events:
+            self.schedule(event)
+
+        logger.info(f"Запланированы напоминания для событий: {len(self._due)}")
+
+    async def _run_due(self) -> None:
+        """Отправка всех наступивших напоминаний"""
+        now = datetime.now(tz=timezone.utc)
+
+        while self._heap and self._heap[0][0] <= now:
+            due_at, event_id = heapq.heappop(self._heap)
+            if self._due.get(event_id) != due_at:
+                continue
+
+            del self._due[event_id]
+            await self._send_reminder(event_id)
+
+    async def _send_reminder(self, event_id: int) -> None:
+        # Событие перечитывается: к моменту напоминания оно могло быть отменено или перенесено
+        event = await EventsRepository.get_by_id(event_id)
+        if event is None or event.status != EventStatus.ACTIVE:
+            self.unschedule(event_id)
+            return
+
+        # Напоминание записывается до публикации: после перезапуска или смены ведущей реплики
+        # _load восстановит его из БД, даже если получателей не было или рассылка не удалась
+        try:
+            reminder = await EventNotificationsRepository.create(event=event, notification_type=NotificationType.REMINDER)
+        except Exception as e:
+            logger.error(f"Ошибка записи напоминания для события {event_id}, повтор через "
+                         f"{self.RETRY_DELAY_SECONDS} с: {e}")
+            due_at = datetime.now(tz=timezone.utc) + timedelta(seconds=self.RETRY_DELAY_SECONDS)
+            self._due[event_id] = due_at
+            heapq.heappush(self._heap, (due_at, event_id))
+            return
+
+        self._last_sent[event_id] = reminder.sent_at
+        await self.event_bus.publish(ReminderDue(event))
+        self.schedule(event)
+
+    async def _wait_for_next(self) -> None:
+        timeout = self.MAX_SLEEP_SECONDS
+        if self._heap:
+            delay = (self._heap[0][0] - datetime.now(tz=timezone.utc)).total_seconds()
+            timeout = max(0.0, min(delay, timeout))
+
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+
+# SINGLETON
+reminder_scheduler: Final[ReminderScheduler] = None
+
+def get_or_create(event_bus: EventBus) -> ReminderScheduler:
+    global reminder_scheduler
+    if reminder_scheduler is None:
+        reminder_scheduler = ReminderScheduler(event_bus)
+    return reminder_scheduler
+
+def get() -> ReminderScheduler | None:
+    global reminder_scheduler
+    return reminder_scheduler
@@ -1,10 +1,13 @@
+from datetime import datetime, timedelta, timezone
+
 from aiogram.exceptions import TelegramBadRequest
 from loguru import logger
 
+from src.bot.db.models import User
 from src.bot.db.repositories.admin import AdminRepository
 from src.bot.localization.translator import LocalizedTranslator
 from src.bot.misc.callback_data.admin import (
-    UserSection
+    UserSection, UserManagementCallback, PageDirection
 )
 from src.bot.misc.keyboards.admin.users_management import (
     get_users_list_keyboard
@@ -12,24 +15,38 @@ from src.bot.misc.keyboards.admin.users_management import (
 from src.bot.services.deeplink_service import DeeplinkService
 
 
+# Начало отсчёта для курсора: created_at передаётся в callback data целым числом микросекунд
+CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
 async def show_users_section(
         callback,
-        section: UserSection,
-        page: int = 1,
+        page_data: UserManagementCallback,
         translator: LocalizedTranslator = None
 ):
     """Показать раздел с пользователями с пагинацией"""
+    section = page_data.section
+    is_callback = False
     try:
         # Получаем данные
-        users, total_users, bot_username, message_obj, is_callback = await _get_section_data(
-            callback, section, page
-        )
+        page_data, users, has_prev, has_next = await _get_users_page(page_data)
+        total_users, bot_username, message_obj, is_callback = await _get_section_data(callback, section)
 
         # Формируем текст
-        text = await _build_section_text(users, total_users, section, page, bot_username, translator)
+        text = await _build_section_text(users, total_users, page_data, bot_username, translator)
 
         # Формируем клавиатуру
-        keyboard = get_users_list_keyboard(translator, section, page, total_users)
+        total_pages = max(
+            page_data.page,
+            (total_users + AdminRepository.USERS_PER_PAGE - 1) // AdminRepository.USERS_PER_PAGE
+        )
+        keyboard = get_users_list_keyboard(
+            translator,
+            page_data,
+            total_pages,
+            prev_page=_get_page_callback(page_data, users[0], PageDirection.PREV) if has_prev else None,
+            next_page=_get_page_callback(page_data, users[-1], PageDirection.NEXT) if has_next else None,
+        )
 
         # Отображаем результат
         await _display_section_result(message_obj, text, keyboard, is_callback, callback)
@@ -40,9 +57,53 @@ async def show_users_section(
         await _handle_section_error(e, section, callback, is_callback, translator)
 
 
-async def _get_section_data(callback, section: UserSection, page: int):
+def _encode_cursor(created_at: datetime) -> int:
+    return (created_at - CURSOR_EPOCH) // timedelta(microseconds=1)
+
+
+def _decode_cursor(page_data: UserManagementCallback) -> tuple[datetime, int] | None:
+    if page_data.cursor_ts is None or page_data.cursor_id is None:
+        return None
+    return CURSOR_EPOCH + timedelta(microseconds=page_data.cursor_ts), page_data.cursor_id
+
+
+def _get_page_callback(
+        page_data: UserManagementCallback,
+        edge_user: User,
+        direction: PageDirection
+) -> UserManagementCallback:
+    """Callback соседней страницы: курсор - крайний пользователь текущей страницы"""
+    return UserManagementCallback(
+        section=page_data.section,
+        page=page_data.page + 1 if direction == PageDirection.NEXT else page_data.page - 1,
+        cursor_ts=_encode_cursor(edge_user.created_at),
+        cursor_id=edge_user.id,
+        direction=direction,
+    )
+
+
+async def _get_users_page(
+        page_data: UserManagementCallback
+) -> tuple[UserManagementCallback, list[User], bool, bool]:
+    """Пользователи страницы и наличие соседних страниц"""
+    section = page_data.section.value
+    cursor = _decode_cursor(page_data)
+    backward = page_data.direction == PageDirection.PREV
+
+    users, has_more = await AdminRepository.get_users_page(section, cursor=cursor, backward=backward)
+    if backward and len(users) < AdminRepository.USERS_PER_PAGE:
+        # Перед курсором меньше страницы (пользователей стало меньше) - показываем первую страницу
+        page_data = UserManagementCallback(section=page_data.section)
+        users, has_more = await AdminRepository.get_users_page(section)
+        return page_data, users, False, has_more
+
+    if backward:
+        return page_data, users, has_more, True
+    return page_data, users, cursor is not None, has_more
+
+
+async def _get_section_data(callback, section: UserSection):
     """Получить данные для отображения раздела"""
-    users = await AdminRepository.get_users_by_section(section.value, page=page)
     total_users = await AdminRepository.get_users_count_by_section(section.value)
 
     # Определяем тип объекта (CallbackQuery или Message)
@@ -57,18 +118,19 @@ async def _get_section_data(callback, section: UserSection, page: int):
         message_obj = callback
         is_callback = False
 
-    return users, total_users, bot_username, message_obj, is_callback
+    return total_users, bot_username, message_obj, is_callback
 
 
 async def _build_section_text(
         users: list,
         total_users: int,
-        section: UserSection,
-        page: int,
+        page_data: UserManagementCallback,
         bot_username: str,
         translator: LocalizedTranslator
 ) -> str:
     """Построить текст раздела с пользователями"""
+    section = page_data.section
+
     # Заголовок раздела с информацией о пагинации
     section_title = translator.get(
         key=f"user_management_{section.value}_title",
@@ -77,15 +139,15 @@ async def _build_section_text(
 
     text = f"{translator.get('user_management_title')}\n\n{section_title}\n"
 
-    # Информация о странице
-    start_user = (page - 1) * AdminRepository.USERS_PER_PAGE + 1
-    end_user = min(page * AdminRepository.USERS_PER_PAGE, total_users)
-    if total_users > 0:
+    # Информация о странице (общее количество приблизительное, поэтому не меньше показанного)
+    start_user = (page_data.page - 1) * AdminRepository.USERS_PER_PAGE + 1
+    end_user = start_user + len(users) - 1
+    if users:
         text += translator.get(
             "pagination_info",
             start=start_user,
             end=end_user,
-            total=total_users
+            total=max(total_users, end_user)
         ) + "\n\n"
 
     # Список пользователей